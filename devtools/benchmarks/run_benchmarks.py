@@ -0,0 +1,648 @@
+"""
+Benchmarks of the public utilities in openff-utilities.
+
+Each benchmark times one utility against synthetic fixtures (e.g. a ``PATH`` with
+thousands of directories, a fake conda environment, a package with a large data
+directory), so that results do not depend on what is installed on the machine running
+them.
+
+Usage
+-----
+Run every benchmark and write the results to a JSON file::
+
+    python devtools/benchmarks/run_benchmarks.py --output results.json
+
+Run only the benchmarks whose names contain a string::
+
+    python devtools/benchmarks/run_benchmarks.py -k data_path
+
+Compare against the results of a previous run (e.g. of the last release), exiting with
+a non-zero status if any benchmark is more than 20% slower::
+
+    python devtools/benchmarks/run_benchmarks.py --compare baseline.json --threshold 1.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from typing import Any
+
+# The number of synthetic entries in each fixture
+PATH_DIRECTORIES = 2000
+CONDA_PACKAGES = 1000
+DATA_FILES = 5000
+
+# name -> (benchmark, number of calls per repeat)
+BENCHMARKS: dict[str, tuple[Callable[[str], Generator[Callable[[], Any], None, None]], int]] = {}
+
+
+def benchmark(name: str, number: int) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Register a benchmark.
+
+    The decorated function is a generator which is given a scratch directory, performs
+    any setup, yields the function to time and then performs any teardown.
+    """
+
+    def decorator(function: Callable[..., Any]) -> Callable[..., Any]:
+        BENCHMARKS[name] = (function, number)
+        return function
+
+    return decorator
+
+
+@contextmanager
+def patched_environment(**variables: str) -> Generator[None, None, None]:
+    original = {name: os.environ.get(name) for name in variables}
+    os.environ.update(variables)
+
+    try:
+        yield
+    finally:
+        for name, value in original.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+@contextmanager
+def prepended_sys_path(directory_path: str) -> Generator[None, None, None]:
+    """Make the packages in a directory importable, forgetting them (and any cached
+    paths into them) afterwards, as the directory is deleted after each benchmark."""
+    from openff.utilities import clear_data_path_cache, clear_package_cache
+
+    sys.path.insert(0, directory_path)
+
+    try:
+        yield
+    finally:
+        sys.path.remove(directory_path)
+
+        for name, module in list(sys.modules.items()):
+            if (getattr(module, "__file__", None) or "").startswith(directory_path):
+                del sys.modules[name]
+
+        clear_package_cache()
+        clear_data_path_cache()
+
+
+def make_fake_path(root: str, n_directories: int = PATH_DIRECTORIES) -> str:
+    """Create a ``PATH`` of many directories, each holding a few executables, with a
+    ``openff-benchmark-target`` executable only in the last."""
+    directories = []
+
+    for index in range(n_directories):
+        directory_path = os.path.join(root, "path", f"bin{index}")
+        os.makedirs(directory_path)
+
+        for name in [f"tool{index}", f"tool{index}-helper"]:
+            with open(os.path.join(directory_path, name), "w") as file:
+                file.write("#!/bin/sh\n")
+
+            os.chmod(os.path.join(directory_path, name), 0o755)
+
+        directories.append(directory_path)
+
+    target = os.path.join(directories[-1], "openff-benchmark-target")
+
+    with open(target, "w") as file:
+        file.write("#!/bin/sh\n")
+
+    os.chmod(target, 0o755)
+
+    return os.pathsep.join(directories)
+
+
+def make_fake_conda_prefix(root: str, n_packages: int = CONDA_PACKAGES) -> str:
+    """Create a conda environment whose ``conda-meta`` records many packages, including
+    AmberTools."""
+    prefix = os.path.join(root, "conda-env")
+    conda_meta = os.path.join(prefix, "conda-meta")
+    os.makedirs(conda_meta)
+
+    packages = [(f"package{index}", f"1.{index}.0") for index in range(n_packages)] + [("ambertools", "24.8")]
+
+    for name, version in packages:
+        with open(os.path.join(conda_meta, f"{name}-{version}-h0_0.json"), "w") as file:
+            json.dump({"name": name, "version": version, "build": "h0_0"}, file)
+
+    return prefix
+
+
+def make_fake_package(root: str, name: str, n_data_files: int = DATA_FILES) -> str:
+    """Create an importable package with a data directory of many small files, spread
+    over nested directories, and return the directory to add to `sys.path`."""
+    site_directory = os.path.join(root, "site")
+    package_directory = os.path.join(site_directory, name)
+    os.makedirs(package_directory)
+
+    with open(os.path.join(package_directory, "__init__.py"), "w") as file:
+        file.write("")
+
+    for index in range(n_data_files):
+        directory_path = os.path.join(package_directory, "data", f"group{index % 50}")
+        os.makedirs(directory_path, exist_ok=True)
+
+        with open(os.path.join(directory_path, f"file{index}.txt"), "w") as file:
+            file.write(f"{index}\n")
+
+    return site_directory
+
+
+def make_fake_openeye() -> dict[str, types.ModuleType]:
+    """Create licensed stand-ins for the OpenEye modules, to be put in `sys.modules`."""
+    from openff.utilities.utilities import _OPENEYE_LICENSE_FUNCTIONS
+
+    modules = {"openeye": types.ModuleType("openeye")}
+
+    for module_name, license_function in _OPENEYE_LICENSE_FUNCTIONS.items():
+        module = types.ModuleType(f"openeye.{module_name}")
+        setattr(module, license_function, lambda: True)
+        modules[f"openeye.{module_name}"] = module
+
+    return modules
+
+
+@benchmark("import.openff_utilities", number=1)
+def bench_import(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    command = [sys.executable, "-c", "import openff.utilities"]
+
+    yield lambda: subprocess.run(command, check=True)
+
+
+@benchmark("has_package.cached", number=100_000)
+def bench_has_package_cached(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import has_package
+
+    has_package("json")
+
+    yield lambda: has_package("json")
+
+
+@benchmark("has_package.probe_cold", number=200)
+def bench_has_package_probe_cold(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import clear_package_cache, has_package
+
+    def run() -> None:
+        clear_package_cache()
+        has_package("openff_benchmark_package")
+        has_package("openff_benchmark_missing")
+
+    with prepended_sys_path(make_fake_package(scratch, "openff_benchmark_package", n_data_files=0)):
+        yield run
+
+
+@benchmark("has_package.isolated_cold", number=5)
+def bench_has_package_isolated(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import clear_package_cache, has_package
+
+    def run() -> None:
+        clear_package_cache()
+        has_package("json", level="isolated")
+
+    yield run
+
+
+@benchmark("requires_package.overhead", number=200_000)
+def bench_requires_package(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import requires_package
+
+    @requires_package("json")
+    def function() -> None:
+        pass
+
+    function()
+
+    yield function
+
+
+@benchmark("requires_oe_module.overhead", number=200_000)
+def bench_requires_oe_module(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import clear_package_cache, requires_oe_module
+
+    fake_modules = make_fake_openeye()
+    original = {name: sys.modules.get(name) for name in fake_modules}
+    sys.modules.update(fake_modules)
+    clear_package_cache()
+
+    @requires_oe_module("oechem")
+    def function() -> None:
+        pass
+
+    function()
+
+    try:
+        yield function
+    finally:
+        for name, module in original.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+        clear_package_cache()
+
+
+@benchmark("has_executable.long_path_cached", number=100_000)
+def bench_has_executable_cached(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import has_executable
+
+    with patched_environment(PATH=make_fake_path(scratch)):
+        has_executable("openff-benchmark-target")
+
+        yield lambda: has_executable("openff-benchmark-target")
+
+
+@benchmark("has_executable.long_path_cold", number=5)
+def bench_has_executable_cold(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import clear_executable_cache, has_executable
+
+    def run() -> None:
+        clear_executable_cache()
+        has_executable("openff-benchmark-target")
+
+    with patched_environment(PATH=make_fake_path(scratch)):
+        yield run
+
+
+@benchmark("find_executables.long_path_batch", number=100)
+def bench_find_executables(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import find_executables
+
+    names = [f"tool{index}" for index in range(0, PATH_DIRECTORIES, 20)] + ["openff-benchmark-missing"]
+
+    with patched_environment(PATH=make_fake_path(scratch)):
+        find_executables(names)
+
+        yield lambda: find_executables(names)
+
+
+def _temporary_cd_benchmark(**kwargs: Any) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import temporary_cd
+
+    def run() -> None:
+        with temporary_cd(**kwargs):
+            with open("output.txt", "w") as file:
+                file.write("output")
+
+    yield run
+
+
+@benchmark("temporary_cd.new_directory", number=500)
+def bench_temporary_cd(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    yield from _temporary_cd_benchmark()
+
+
+@benchmark("temporary_cd.pool", number=500)
+def bench_temporary_cd_pool(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import ScratchDirectoryPool
+
+    pool = ScratchDirectoryPool(root=scratch)
+
+    yield from _temporary_cd_benchmark(pool=pool)
+
+    pool.clear()
+
+
+@benchmark("temporary_cd.deferred_cleanup", number=500)
+def bench_temporary_cd_deferred(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities.scratch import flush_deferred_removals
+
+    yield from _temporary_cd_benchmark(deferred_cleanup=True)
+
+    flush_deferred_removals()
+
+
+@benchmark("scoped_directory.new_directory", number=500)
+def bench_scoped_directory(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import scoped_directory, scoped_path
+
+    def run() -> None:
+        with scoped_directory():
+            with open(scoped_path("output.txt"), "w") as file:
+                file.write("output")
+
+    yield run
+
+
+@benchmark("get_data_file_path.warm", number=20_000)
+def bench_get_data_file_path_warm(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import get_data_file_path
+
+    with prepended_sys_path(make_fake_package(scratch, "openff_benchmark_data")):
+        get_data_file_path("group7/file7.txt", "openff_benchmark_data")
+
+        yield lambda: get_data_file_path("group7/file7.txt", "openff_benchmark_data")
+
+
+@benchmark("get_data_file_path.cold_large_data_dir", number=5)
+def bench_get_data_file_path_cold(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import clear_data_path_cache, get_data_file_path
+
+    def run() -> None:
+        clear_data_path_cache()
+        get_data_file_path("group7/file7.txt", "openff_benchmark_data")
+
+    with prepended_sys_path(make_fake_package(scratch, "openff_benchmark_data")):
+        yield run
+
+    clear_data_path_cache()
+
+
+@benchmark("get_data_file_paths.batch_1000", number=20)
+def bench_get_data_file_paths(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import get_data_file_paths
+
+    relative_paths = [f"group{index % 50}/file{index}.txt" for index in range(1000)]
+
+    with prepended_sys_path(make_fake_package(scratch, "openff_benchmark_data")):
+        get_data_file_paths(relative_paths, "openff_benchmark_data")
+
+        yield lambda: get_data_file_paths(relative_paths, "openff_benchmark_data")
+
+
+@benchmark("open_data_file.warm", number=20_000)
+def bench_open_data_file(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import open_data_file
+
+    with prepended_sys_path(make_fake_package(scratch, "openff_benchmark_data")):
+        open_data_file("group7/file7.txt", "openff_benchmark_data")
+
+        yield lambda: open_data_file("group7/file7.txt", "openff_benchmark_data")
+
+
+@contextmanager
+def fake_conda_environment(scratch: str) -> Generator[None, None, None]:
+    prefix = make_fake_conda_prefix(scratch)
+
+    with patched_environment(
+        CONDA_PREFIX=prefix,
+        CONDA_SHLVL="1",
+        OPENFF_UTILITIES_CACHE_DIR=os.path.join(scratch, "cache"),
+    ):
+        yield
+
+
+def _clear_provenance_caches() -> None:
+    from openff.utilities import provenance
+
+    provenance._get_conda_list_package_versions.cache_clear()
+    provenance._get_environment_provenance.cache_clear()
+    provenance._PACKAGE_VERSIONS_FUTURE = None
+
+
+@benchmark("get_ambertools_version.cold", number=20)
+def bench_get_ambertools_version_cold(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import get_ambertools_version
+
+    def run() -> None:
+        _clear_provenance_caches()
+        shutil.rmtree(os.path.join(scratch, "cache"), ignore_errors=True)
+        get_ambertools_version()
+
+    with fake_conda_environment(scratch):
+        yield run
+
+    _clear_provenance_caches()
+
+
+@benchmark("get_ambertools_version.warm", number=20_000)
+def bench_get_ambertools_version_warm(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import get_ambertools_version
+
+    with fake_conda_environment(scratch):
+        _clear_provenance_caches()
+        get_ambertools_version()
+
+        yield get_ambertools_version
+
+    _clear_provenance_caches()
+
+
+@benchmark("environment_fingerprint.memoized", number=100_000)
+def bench_environment_fingerprint(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import environment_fingerprint
+
+    environment_fingerprint()
+
+    yield environment_fingerprint
+
+
+@benchmark("environment_fingerprint.revalidate", number=200)
+def bench_environment_fingerprint_revalidate(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import caching, environment_fingerprint
+
+    interval = caching._ENVIRONMENT_FINGERPRINT_REVALIDATE_INTERVAL
+    caching._ENVIRONMENT_FINGERPRINT_REVALIDATE_INTERVAL = 0.0
+
+    try:
+        yield environment_fingerprint
+    finally:
+        caching._ENVIRONMENT_FINGERPRINT_REVALIDATE_INTERVAL = interval
+
+
+@benchmark("provenance_hash.warm", number=10_000)
+def bench_provenance_hash(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import provenance_hash
+
+    with fake_conda_environment(scratch):
+        _clear_provenance_caches()
+        provenance_hash()
+
+        yield provenance_hash
+
+    _clear_provenance_caches()
+
+
+@benchmark("probe_environment.fake_path", number=20)
+def bench_probe_environment(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import clear_executable_cache, clear_package_cache, probe_environment
+
+    packages = ["json", "sqlite3", "openff_benchmark_missing"]
+    executables = [f"tool{index}" for index in range(0, PATH_DIRECTORIES, 100)]
+
+    def run() -> None:
+        clear_package_cache()
+        clear_executable_cache()
+        probe_environment(packages=packages, executables=executables)
+
+    with patched_environment(PATH=make_fake_path(scratch)):
+        yield run
+
+
+@benchmark("disk_memoize.hit", number=2_000)
+def bench_disk_memoize(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import disk_memoize
+
+    with patched_environment(OPENFF_UTILITIES_CACHE_DIR=os.path.join(scratch, "cache")):
+
+        @disk_memoize(name="benchmark", packages=["openff-utilities"])
+        def function(value: int) -> list[int]:
+            return list(range(value))
+
+        function(1000)
+
+        yield lambda: function(1000)
+
+
+def _square(value: int) -> int:
+    return value**2
+
+
+@benchmark("parallel_map.10000_items", number=1)
+def bench_parallel_map(scratch: str) -> Generator[Callable[[], Any], None, None]:
+    from openff.utilities import parallel_map
+
+    yield lambda: sum(parallel_map(_square, range(10_000), max_workers=4, chunksize=250))
+
+
+def run_benchmark(name: str, repeat: int, scale: float) -> dict[str, Any]:
+    function, number = BENCHMARKS[name]
+    number = max(1, int(number * scale))
+
+    with tempfile.TemporaryDirectory(prefix="openff-benchmark-") as scratch:
+        generator = function(scratch)
+        timed_function = next(generator)
+
+        timings = []
+
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+
+                for _ in range(number):
+                    timed_function()
+
+                timings.append((time.perf_counter() - start) / number)
+        finally:
+            generator.close()
+
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+    }
+
+
+def get_metadata() -> dict[str, Any]:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        package_version = version("openff-utilities")
+    except PackageNotFoundError:
+        package_version = None
+
+    return {
+        "openff_utilities": package_version,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def format_duration(seconds: float) -> str:
+    for unit, scale in [("s", 1.0), ("ms", 1e-3), ("us", 1e-6)]:
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def compare(baseline: dict[str, Any], results: dict[str, Any], threshold: float) -> list[str]:
+    """Print how each benchmark changed since the baseline, returning the names of any
+    which slowed down by more than ``threshold``."""
+    regressions = []
+
+    print(f"\n{'benchmark':<45} {'baseline':>12} {'current':>12} {'ratio':>8}")
+
+    for name, current in results["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+
+        if previous is None:
+            print(f"{name:<45} {'-':>12} {format_duration(current['median']):>12} {'new':>8}")
+            continue
+
+        ratio = current["median"] / previous["median"] if previous["median"] else float("inf")
+        flag = "  REGRESSION" if ratio > threshold else ""
+
+        print(
+            f"{name:<45} {format_duration(previous['median']):>12} "
+            f"{format_duration(current['median']):>12} {ratio:>7.2f}x{flag}"
+        )
+
+        if ratio > threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filter", default="", help="Only run benchmarks whose names contain this string.")
+    parser.add_argument("--output", help="The JSON file to write the results to.")
+    parser.add_argument("--compare", help="A JSON file of earlier results to compare against.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="The ratio of current to baseline median time above which a benchmark has regressed.",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="The number of times to repeat each benchmark.")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="A factor to scale the number of calls per repeat by, e.g. 0.01 for a quick run.",
+    )
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit.")
+    arguments = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if arguments.filter in name]
+
+    if arguments.list:
+        print("\n".join(names))
+        return 0
+
+    results: dict[str, Any] = {"metadata": get_metadata(), "benchmarks": {}}
+
+    for name in names:
+        result = run_benchmark(name, arguments.repeat, arguments.scale)
+        results["benchmarks"][name] = result
+
+        print(f"{name:<45} {format_duration(result['median']):>12} (min {format_duration(result['min'])})")
+
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            baseline = json.load(file)
+
+        regressions = compare(baseline, results, arguments.threshold)
+
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {arguments.threshold:.2f}x")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
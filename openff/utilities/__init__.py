@@ -1,30 +1,171 @@
-from importlib.metadata import version
-
-from openff.utilities.exceptions import MissingOptionalDependencyError
-from openff.utilities.provenance import get_ambertools_version
-from openff.utilities.testing import skip_if_missing, skip_if_missing_exec
-from openff.utilities.utilities import (
-    get_data_dir_path,
-    get_data_file_path,
-    has_executable,
-    has_package,
-    requires_oe_module,
-    requires_package,
-    temporary_cd,
-)
+import importlib
+
+# Avoid importing `typing` at runtime, which accounts for most of the cost of importing
+# this module; type checkers treat any variable named TYPE_CHECKING as True
+TYPE_CHECKING = False
+
+if TYPE_CHECKING:
+    from openff.utilities.caching import disk_memoize, environment_fingerprint
+    from openff.utilities.exceptions import MissingOptionalDependencyError
+    from openff.utilities.instrumentation import (
+        dump_instrumentation_stats,
+        enable_instrumentation,
+        get_instrumentation_stats,
+        instrumentation_summary,
+        merge_instrumentation_stats,
+        reset_instrumentation,
+    )
+    from openff.utilities.parallel import parallel_map
+    from openff.utilities.probing import CapabilityReport, ImportProbeResult, probe_environment, probe_import
+    from openff.utilities.provenance import (
+        diff_provenance,
+        get_ambertools_version,
+        get_ambertools_version_async,
+        get_environment_provenance,
+        get_executable_versions,
+        prefetch_provenance,
+        provenance_hash,
+    )
+    from openff.utilities.scratch import ScratchDirectoryPool
+    from openff.utilities.testing import skip_if_missing, skip_if_missing_exec
+    from openff.utilities.utilities import (
+        clear_data_path_cache,
+        clear_executable_cache,
+        clear_package_cache,
+        find_executable,
+        find_executables,
+        get_data_dir_path,
+        get_data_file_path,
+        get_data_file_paths,
+        get_scoped_directory,
+        has_executable,
+        has_package,
+        lazy_import,
+        open_data_file,
+        openeye_license_status,
+        requires_oe_module,
+        requires_package,
+        scoped_directory,
+        scoped_path,
+        scoped_run,
+        temporary_cd,
+    )
+
+# Public names are imported from their submodules on first access (see `__getattr__`), so
+# that importing `openff.utilities` itself stays cheap.
+_LAZY_IMPORTS = {
+    "CapabilityReport": "openff.utilities.probing",
+    "ImportProbeResult": "openff.utilities.probing",
+    "MissingOptionalDependencyError": "openff.utilities.exceptions",
+    "ScratchDirectoryPool": "openff.utilities.scratch",
+    "clear_data_path_cache": "openff.utilities.utilities",
+    "clear_executable_cache": "openff.utilities.utilities",
+    "clear_package_cache": "openff.utilities.utilities",
+    "diff_provenance": "openff.utilities.provenance",
+    "disk_memoize": "openff.utilities.caching",
+    "dump_instrumentation_stats": "openff.utilities.instrumentation",
+    "enable_instrumentation": "openff.utilities.instrumentation",
+    "environment_fingerprint": "openff.utilities.caching",
+    "find_executable": "openff.utilities.utilities",
+    "find_executables": "openff.utilities.utilities",
+    "get_ambertools_version": "openff.utilities.provenance",
+    "get_ambertools_version_async": "openff.utilities.provenance",
+    "get_data_dir_path": "openff.utilities.utilities",
+    "get_data_file_path": "openff.utilities.utilities",
+    "get_data_file_paths": "openff.utilities.utilities",
+    "get_environment_provenance": "openff.utilities.provenance",
+    "get_executable_versions": "openff.utilities.provenance",
+    "get_instrumentation_stats": "openff.utilities.instrumentation",
+    "get_scoped_directory": "openff.utilities.utilities",
+    "has_executable": "openff.utilities.utilities",
+    "has_package": "openff.utilities.utilities",
+    "instrumentation_summary": "openff.utilities.instrumentation",
+    "lazy_import": "openff.utilities.utilities",
+    "merge_instrumentation_stats": "openff.utilities.instrumentation",
+    "open_data_file": "openff.utilities.utilities",
+    "openeye_license_status": "openff.utilities.utilities",
+    "parallel_map": "openff.utilities.parallel",
+    "prefetch_provenance": "openff.utilities.provenance",
+    "probe_environment": "openff.utilities.probing",
+    "probe_import": "openff.utilities.probing",
+    "provenance_hash": "openff.utilities.provenance",
+    "requires_oe_module": "openff.utilities.utilities",
+    "requires_package": "openff.utilities.utilities",
+    "reset_instrumentation": "openff.utilities.instrumentation",
+    "scoped_directory": "openff.utilities.utilities",
+    "scoped_path": "openff.utilities.utilities",
+    "scoped_run": "openff.utilities.utilities",
+    "skip_if_missing": "openff.utilities.testing",
+    "skip_if_missing_exec": "openff.utilities.testing",
+    "temporary_cd": "openff.utilities.utilities",
+}
 
 __all__ = (
+    "CapabilityReport",
+    "ImportProbeResult",
     "MissingOptionalDependencyError",
+    "ScratchDirectoryPool",
+    "clear_data_path_cache",
+    "clear_executable_cache",
+    "clear_package_cache",
+    "diff_provenance",
+    "disk_memoize",
+    "dump_instrumentation_stats",
+    "enable_instrumentation",
+    "environment_fingerprint",
+    "find_executable",
+    "find_executables",
     "get_ambertools_version",
+    "get_ambertools_version_async",
     "get_data_dir_path",
     "get_data_file_path",
+    "get_data_file_paths",
+    "get_environment_provenance",
+    "get_executable_versions",
+    "get_instrumentation_stats",
+    "get_scoped_directory",
     "has_executable",
     "has_package",
+    "instrumentation_summary",
+    "lazy_import",
+    "merge_instrumentation_stats",
+    "open_data_file",
+    "openeye_license_status",
+    "parallel_map",
+    "prefetch_provenance",
+    "probe_environment",
+    "probe_import",
+    "provenance_hash",
     "requires_oe_module",
     "requires_package",
+    "reset_instrumentation",
+    "scoped_directory",
+    "scoped_path",
+    "scoped_run",
     "skip_if_missing",
     "skip_if_missing_exec",
     "temporary_cd",
 )
 
-__version__ = version("openff.utilities")
+
+def __getattr__(name: str) -> object:
+    if name == "__version__":
+        from importlib.metadata import version
+
+        globals()["__version__"] = version("openff.utilities")
+
+        return globals()["__version__"]
+
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_IMPORTS, "__version__"])
@@ -0,0 +1,168 @@
+import os
+import threading
+
+from openff.utilities.caching import (
+    atomic_write,
+    disk_memoize,
+    environment_fingerprint,
+    evict_least_recently_used,
+    file_lock,
+    get_cache_dir,
+)
+
+
+def test_get_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENFF_UTILITIES_CACHE_DIR", str(tmp_path / "cache"))
+
+    assert get_cache_dir("nested") == str(tmp_path / "cache" / "nested")
+    assert os.path.isdir(tmp_path / "cache" / "nested")
+
+
+def test_atomic_write(tmp_path):
+    file_path = tmp_path / "nested" / "file.dat"
+
+    atomic_write(str(file_path), b"first")
+    atomic_write(str(file_path), b"second")
+
+    assert file_path.read_bytes() == b"second"
+    assert os.listdir(tmp_path / "nested") == ["file.dat"]
+
+
+def test_evict_least_recently_used(tmp_path):
+    for index, name in enumerate(["oldest", "older", "newest"]):
+        (tmp_path / name).write_bytes(b"0" * 10)
+        os.utime(tmp_path / name, (index, index))
+
+    assert evict_least_recently_used(str(tmp_path), max_bytes=15) == 2
+    assert os.listdir(tmp_path) == ["newest"]
+
+
+def test_file_lock(tmp_path):
+    lock_path = str(tmp_path / "file.lock")
+    events = []
+
+    def worker(index):
+        with file_lock(lock_path):
+            events.append(("enter", index))
+            events.append(("exit", index))
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Each holder of the lock exits before the next one enters
+    assert all(events[i][1] == events[i + 1][1] for i in range(0, len(events), 2))
+
+
+def test_environment_fingerprint(tmp_path, monkeypatch):
+    monkeypatch.setattr("openff.utilities.caching._ENVIRONMENT_FINGERPRINT_REVALIDATE_INTERVAL", 0.0)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    fingerprint = environment_fingerprint()
+
+    assert len(fingerprint) == 16
+    assert environment_fingerprint() == fingerprint
+
+    # Files other than distribution metadata, e.g. in a source checkout, are ignored
+    (tmp_path / "module.py").write_text("")
+    assert environment_fingerprint() == fingerprint
+
+    (tmp_path / "package-1.0.dist-info").mkdir()
+    installed_fingerprint = environment_fingerprint()
+    assert installed_fingerprint != fingerprint
+
+    monkeypatch.setenv("PATH", os.pathsep.join([str(tmp_path), os.environ.get("PATH", "")]))
+    assert environment_fingerprint() != installed_fingerprint
+
+
+def test_environment_fingerprint_working_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr("openff.utilities.caching._ENVIRONMENT_FINGERPRINT_REVALIDATE_INTERVAL", 0.0)
+    monkeypatch.syspath_prepend("")
+    (tmp_path / "package-1.0.dist-info").mkdir()
+
+    fingerprint = environment_fingerprint()
+
+    # The working directory is not part of the fingerprint, even when it is on `sys.path`
+    # or ``PATH``
+    monkeypatch.chdir(tmp_path)
+    assert environment_fingerprint() == fingerprint
+
+    monkeypatch.setenv("PATH", os.pathsep.join([".", os.environ.get("PATH", "")]))
+    fingerprint = environment_fingerprint()
+
+    (tmp_path / "other").mkdir()
+    os.utime(tmp_path / "other", ns=(0, 0))
+
+    monkeypatch.chdir(tmp_path / "other")
+    assert environment_fingerprint() == fingerprint
+
+
+def test_disk_memoize(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENFF_UTILITIES_CACHE_DIR", str(tmp_path / "cache"))
+
+    calls = []
+
+    @disk_memoize(packages=["pytest", "openff-fake-package"], executables=["python"])
+    def square(value, offset=0):
+        calls.append(value)
+        return value**2 + offset
+
+    assert square(3) == 9
+    assert square(3) == 9
+    assert square(value=3, offset=0) == 9
+    assert square(3, offset=1) == 10
+
+    assert calls == [3, 3]
+
+    # Results are keyed by the versions of the dependencies, so are not shared with a
+    # function which has different dependencies
+    @disk_memoize(name=f"{square.__module__}.{square.__qualname__}", packages=["pytest"])
+    def different_dependencies(value, offset=0):
+        calls.append(value)
+
+    different_dependencies(3)
+    assert calls == [3, 3, 3]
+
+
+def test_disk_memoize_dependency_versions(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENFF_UTILITIES_CACHE_DIR", str(tmp_path / "cache"))
+
+    versions = {"packages": {"openff-fake-package": "1.0"}, "executables": {}}
+    monkeypatch.setattr("openff.utilities.provenance._get_dependency_versions", lambda *_: versions)
+    monkeypatch.setattr("openff.utilities.caching.environment_fingerprint", lambda: str(versions))
+
+    calls = []
+
+    @disk_memoize(packages=["openff-fake-package"])
+    def function(value):
+        calls.append(value)
+        return value
+
+    function(1)
+    function(1)
+
+    versions = {"packages": {"openff-fake-package": "2.0"}, "executables": {}}
+
+    function(1)
+    function(1)
+
+    assert calls == [1, 1]
+
+
+def test_disk_memoize_eviction(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENFF_UTILITIES_CACHE_DIR", str(tmp_path / "cache"))
+
+    @disk_memoize(name="evicted", max_bytes=4096)
+    def large(value):
+        return bytes(1024) + value.to_bytes(4, "little")
+
+    for value in range(32):
+        large(value)
+
+    cache_files = [path for path in (tmp_path / "cache" / "memoize" / "evicted").rglob("*") if path.is_file()]
+
+    assert 0 < len(cache_files) < 32
+    assert sum(path.stat().st_size for path in cache_files) <= 4096
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from openff.utilities import instrumentation
+from openff.utilities.instrumentation import (
+    dump_instrumentation_stats,
+    get_instrumentation_stats,
+    increment,
+    instrumentation_summary,
+    merge_instrumentation_stats,
+    timer,
+)
+from openff.utilities.parallel import parallel_map
+from openff.utilities.utilities import find_executables, get_data_file_path, requires_package, temporary_cd
+
+
+@pytest.fixture
+def enabled_instrumentation():
+    instrumentation.reset_instrumentation()
+    instrumentation.enable_instrumentation()
+
+    yield
+
+    instrumentation.enable_instrumentation(False)
+    instrumentation.reset_instrumentation()
+
+
+def _count(_):
+    increment("test.worker_calls")
+
+
+def test_instrumentation_disabled():
+    instrumentation.reset_instrumentation()
+
+    with timer("test.timer"):
+        increment("test.counter")
+
+    assert get_instrumentation_stats()["counters"] == {}
+    assert get_instrumentation_stats()["timers"] == {}
+
+
+def test_instrumentation(enabled_instrumentation, tmp_path):
+    with timer("test.timer"):
+        increment("test.counter", 2)
+
+    @requires_package("json")
+    def function():
+        pass
+
+    function()
+    function()
+
+    with temporary_cd():
+        pass
+
+    find_executables(["python"])
+    get_data_file_path("data.dat", "openff.utilities")
+
+    stats = get_instrumentation_stats()
+
+    assert stats["counters"]["test.counter"] == 2
+    assert stats["counters"]["requires_package.cache_hits"] >= 1
+    assert stats["counters"]["data_path.index_lookups"] == 1
+    assert stats["timers"]["test.timer"]["count"] == 1
+
+    for name in ["temporary_directory.setup", "temporary_directory.teardown", "executables.find"]:
+        assert stats["timers"][name]["count"] == 1
+
+    assert json.loads(dump_instrumentation_stats(str(tmp_path / "stats.json"))) == stats
+    assert json.loads((tmp_path / "stats.json").read_text()) == stats
+
+    summary = instrumentation_summary()
+
+    assert "test.timer" in summary
+    assert "test.counter" in summary
+
+
+def test_merge_instrumentation_stats():
+    merged = merge_instrumentation_stats(
+        [
+            {"pids": [1], "counters": {"a": 1}, "timers": {"t": {"count": 1, "total": 1.0, "max": 1.0}}},
+            {"pids": [2], "counters": {"a": 2, "b": 1}, "timers": {"t": {"count": 2, "total": 1.0, "max": 0.75}}},
+        ]
+    )
+
+    assert merged == {
+        "pids": [1, 2],
+        "counters": {"a": 3, "b": 1},
+        "timers": {"t": {"count": 3, "total": 2.0, "max": 1.0}},
+    }
+
+
+def test_parallel_map_instrumentation(enabled_instrumentation):
+    list(parallel_map(_count, range(6), max_workers=2, chunksize=2))
+
+    assert get_instrumentation_stats()["counters"]["test.worker_calls"] == 6
@@ -0,0 +1,71 @@
+import os
+import pickle
+import sys
+
+import pytest
+
+from openff.utilities.exceptions import MissingOptionalDependencyError
+from openff.utilities.parallel import parallel_map
+from openff.utilities.utilities import get_scoped_directory
+
+
+def _square(value):
+    return value**2
+
+
+def _worker_directory(_):
+    assert get_scoped_directory() == os.getcwd()
+
+    with open("scratch.txt", "a") as file:
+        file.write("x")
+
+    return os.getcwd()
+
+
+def _loaded_modules(_):
+    return "json" in sys.modules
+
+
+def test_parallel_map():
+    assert list(parallel_map(_square, range(10), max_workers=2)) == [value**2 for value in range(10)]
+    assert list(parallel_map(_square, range(10), max_workers=2, chunksize=3)) == [value**2 for value in range(10)]
+    assert sorted(parallel_map(_square, range(10), max_workers=2, ordered=False)) == [value**2 for value in range(10)]
+    assert list(parallel_map(_square, [], max_workers=2)) == []
+
+
+def test_parallel_map_streams():
+    results = parallel_map(_square, iter(range(1_000_000)), max_workers=2, chunksize=10)
+
+    assert [next(results) for _ in range(5)] == [0, 1, 4, 9, 16]
+
+    results.close()
+
+
+def test_parallel_map_worker_directories():
+    directories = list(parallel_map(_worker_directory, range(8), max_workers=2))
+
+    assert len(set(directories)) <= 2
+    assert os.getcwd() not in directories
+    assert not any(os.path.exists(directory) for directory in directories)
+
+
+def test_parallel_map_warms_workers():
+    assert all(parallel_map(_loaded_modules, range(4), packages=["json"], max_workers=2))
+
+
+def test_parallel_map_missing_dependency():
+    with pytest.raises(MissingOptionalDependencyError, match="nummmmmmpy") as error_info:
+        parallel_map(_square, range(4), packages=["nummmmmmpy"])
+
+    assert error_info.value.library_name == "nummmmmmpy"
+
+    with pytest.raises(ValueError, match="Unknown OpenEye module"):
+        parallel_map(_square, range(4), oe_modules=["oefake"])
+
+
+def test_missing_optional_dependency_error_pickle():
+    error = pickle.loads(pickle.dumps(MissingOptionalDependencyError("openeye.oechem", license_issue=True)))
+
+    assert error.library_name == "openeye.oechem"
+    assert error.license_issue
+    assert str(error) == str(MissingOptionalDependencyError("openeye.oechem", license_issue=True))
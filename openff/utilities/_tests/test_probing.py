@@ -0,0 +1,130 @@
+import json
+import os
+import sys
+
+import pytest
+
+from openff.utilities.probing import probe_environment, probe_import
+from openff.utilities.utilities import clear_package_cache, has_package
+
+
+def test_probe_environment():
+    report = probe_environment(
+        packages=["json", "nummmmmmpy"],
+        executables=["python", "pyyyyython"],
+        oe_modules=["oechem"],
+    )
+
+    assert report.packages == {"json": True, "nummmmmmpy": False}
+    assert report.executables["python"] is not None
+    assert report.executables["pyyyyython"] is None
+    assert report.oe_modules["oechem"] is has_package("openeye.oechem")
+
+    assert json.loads(json.dumps(report.to_dict())) == report.to_dict()
+
+
+def test_probe_environment_isolated(tmp_path, monkeypatch):
+    (tmp_path / "openff_crashing_package.py").write_text("import os\nos.abort()\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    clear_package_cache()
+
+    report = probe_environment(isolated_packages=["json", "openff_crashing_package"])
+
+    assert report.packages == {"json": True, "openff_crashing_package": False}
+    assert "openff_crashing_package" not in sys.modules
+
+    # The results are reused by later checks, so the crashing package is not imported
+    assert not has_package("openff_crashing_package", level="isolated")
+
+    clear_package_cache()
+
+
+def test_probe_environment_unknown_oe_module():
+    with pytest.raises(ValueError, match="Unknown OpenEye module"):
+        probe_environment(oe_modules=["oefake"])
+
+
+def test_probe_import(tmp_path, monkeypatch):
+    (tmp_path / "openff_crashing_package.py").write_text("import os\nos.abort()\n")
+    (tmp_path / "openff_hanging_package.py").write_text("import time\ntime.sleep(60)\n")
+    (tmp_path / "openff_heavy_package.py").write_text("print('noise')\nDATA = bytearray(64 * 1024 * 1024)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    result = probe_import("openff_heavy_package")
+
+    assert result.importable
+    assert result.error is None
+    assert result.import_time > 0.0
+    assert result.memory is None or result.memory >= 32 * 1024 * 1024
+    assert "openff_heavy_package" not in sys.modules
+
+    result = probe_import("openff_crashing_package")
+
+    assert not result.importable
+    assert "crashed" in result.error or "status" in result.error
+
+    result = probe_import("openff_hanging_package", timeout=0.5)
+
+    assert not result.importable
+    assert "timed out" in result.error
+
+    result = probe_import("nummmmmmpy")
+
+    assert not result.importable
+    assert "ModuleNotFoundError" in result.error
+
+    # The helper process survives the failed imports
+    assert probe_import("json").importable
+
+
+def test_has_package_isolated(tmp_path, monkeypatch):
+    (tmp_path / "openff_crashing_package.py").write_text("import os\nos.abort()\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    clear_package_cache()
+
+    assert has_package("json", level="isolated")
+    assert not has_package("openff_crashing_package", level="isolated")
+    assert "openff_crashing_package" not in sys.modules
+
+    clear_package_cache()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+@pytest.mark.filterwarnings("ignore:.*multi-threaded.*fork:DeprecationWarning")
+def test_probe_import_fork():
+    from openff.utilities.probing import _IMPORT_PROBE_POOL
+
+    def helper_pids():
+        return [helper.process.pid for helper in _IMPORT_PROBE_POOL._idle]
+
+    # Start a helper, which forked children inherit
+    assert probe_import("json").importable
+
+    children = []
+
+    for _ in range(4):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+
+        if pid == 0:
+            # The child starts its own helpers rather than sharing its parent's, whose
+            # answers to requests sent by other processes would be mixed up
+            inherited_helper_pids = helper_pids()
+            results = [probe_import("nummmmmmpy").importable for _ in range(20)]
+            os.write(write_fd, json.dumps([results, inherited_helper_pids]).encode())
+            os._exit(0)
+
+        os.close(write_fd)
+        children.append((pid, read_fd))
+
+    assert [probe_import("json").importable for _ in range(20)] == [True] * 20
+    assert helper_pids()
+
+    for pid, read_fd in children:
+        os.waitpid(pid, 0)
+
+        with os.fdopen(read_fd) as file:
+            results, inherited_helper_pids = json.loads(file.read())
+
+        assert results == [False] * 20
+        assert inherited_helper_pids == []
@@ -1,10 +1,26 @@
+import asyncio
 import importlib
+import json
+import os
+import shutil
+import sys
 
 import pytest
 
 from openff.utilities.provenance import (
+    _get_conda_environment_fingerprint,
     _get_conda_list_package_versions,
+    _list_conda_package_versions_async,
+    _load_or_list_package_versions,
+    _read_conda_meta_package_versions,
+    diff_provenance,
     get_ambertools_version,
+    get_ambertools_version_async,
+    get_environment_provenance,
+    get_executable_versions,
+    prefetch_provenance,
+    provenance_hash,
+    provenance_to_json,
 )
 from openff.utilities.warnings import CondaExecutableNotFoundWarning
 
@@ -52,3 +68,235 @@ def test_conda_available_get_ambertools_version_not_found():
         return
 
     pytest.skip("only run when ambertools is not installed.")
+
+
+def test_read_conda_meta_package_versions(tmp_path):
+    conda_meta = tmp_path / "conda-meta"
+    conda_meta.mkdir()
+
+    (conda_meta / "history").write_text("")
+    (conda_meta / "ambertools-23.6-py312h1577c9a_0.json").write_text("{}")
+    (conda_meta / "python-dateutil-2.9.0.post0-pyhff2d567_1.json").write_text("{}")
+    (conda_meta / "unusual.json").write_text('{"name": "unusual-name", "version": "1.0"}')
+
+    assert _read_conda_meta_package_versions(str(tmp_path)) == {
+        "ambertools": "23.6",
+        "python-dateutil": "2.9.0.post0",
+        "unusual-name": "1.0",
+    }
+
+    assert _read_conda_meta_package_versions(str(tmp_path / "missing")) is None
+
+
+def test_conda_environment_fingerprint(tmp_path, monkeypatch):
+    (tmp_path / "conda-meta").mkdir()
+
+    monkeypatch.setenv("CONDA_PREFIX", str(tmp_path))
+    monkeypatch.setenv("CONDA_SHLVL", "1")
+
+    fingerprint = _get_conda_environment_fingerprint()
+
+    assert fingerprint is not None
+    assert fingerprint == _get_conda_environment_fingerprint()
+
+    os.utime(tmp_path / "conda-meta", ns=(0, 0))
+
+    assert fingerprint != _get_conda_environment_fingerprint()
+
+    monkeypatch.setenv("CONDA_SHLVL", "0")
+    monkeypatch.setenv("PIXI_IN_SHELL", "0")
+
+    assert _get_conda_environment_fingerprint() is None
+
+
+def test_load_or_list_package_versions(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENFF_UTILITIES_CACHE_DIR", str(tmp_path))
+
+    calls = []
+
+    def list_package_versions():
+        calls.append(None)
+        return {"ambertools": "23.6"}
+
+    for _ in range(2):
+        assert _load_or_list_package_versions("first", list_package_versions) == {"ambertools": "23.6"}
+
+    assert len(calls) == 1
+
+    _load_or_list_package_versions("second", list_package_versions)
+
+    assert len(calls) == 2
+
+
+def test_prefetch_provenance(monkeypatch):
+    import openff.utilities.provenance
+
+    monkeypatch.setattr(openff.utilities.provenance, "_PACKAGE_VERSIONS_FUTURE", None)
+    monkeypatch.setattr(
+        openff.utilities.provenance,
+        "_get_conda_list_package_versions",
+        lambda: {"ambertools": "23.6"},
+    )
+
+    future = prefetch_provenance()
+
+    assert prefetch_provenance() is future
+    assert future.result(timeout=10.0) == {"ambertools": "23.6"}
+    assert get_ambertools_version() == "23.6"
+    assert asyncio.run(get_ambertools_version_async()) == "23.6"
+
+
+def test_conda_list_cached_on_disk(tmp_path, monkeypatch):
+    log_path = tmp_path / "calls.log"
+
+    fake_conda = tmp_path / "conda"
+    fake_conda.write_text(
+        f'#!/bin/sh\necho call >> {log_path}\necho \'[{{"name": "ambertools", "version": "23.6"}}]\'\n'
+    )
+    fake_conda.chmod(0o755)
+
+    monkeypatch.setenv("OPENFF_UTILITIES_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("CONDA_PREFIX", raising=False)
+    monkeypatch.setenv("PIXI_IN_SHELL", "1")
+    monkeypatch.setenv("PIXI_EXE", str(fake_conda))
+    monkeypatch.setenv("PIXI_PROJECT_MANIFEST", str(tmp_path / "pixi.toml"))
+
+    def list_package_versions():
+        # Each call stands in for a new process
+        _get_conda_list_package_versions.cache_clear()
+        return _get_conda_list_package_versions()
+
+    def calls():
+        return len(log_path.read_text().splitlines())
+
+    # Without a lock file there is nothing to tell when packages change, so the
+    # packages are listed every time
+    for _ in range(2):
+        assert list_package_versions() == {"ambertools": "23.6"}
+
+    assert calls() == 2
+
+    # Otherwise `pixi list` is only run once
+    (tmp_path / "pixi.lock").write_text("")
+
+    for _ in range(3):
+        assert list_package_versions() == {"ambertools": "23.6"}
+
+    assert calls() == 3
+    assert asyncio.run(_list_conda_package_versions_async()) == {"ambertools": "23.6"}
+    assert calls() == 3
+
+    # Installing or removing packages updates the lock file, which invalidates the
+    # cached result
+    os.utime(tmp_path / "pixi.lock", ns=(0, 0))
+
+    assert list_package_versions() == {"ambertools": "23.6"}
+    assert calls() == 4
+
+    _get_conda_list_package_versions.cache_clear()
+
+
+def test_get_ambertools_version_async_environment_changed(tmp_path, monkeypatch):
+    from concurrent.futures import Future
+
+    import openff.utilities.provenance
+    from openff.utilities.caching import environment_fingerprint
+
+    fake_conda = tmp_path / "conda"
+    fake_conda.write_text('#!/bin/sh\necho \'[{"name": "ambertools", "version": "23.6"}]\'\n')
+    fake_conda.chmod(0o755)
+
+    monkeypatch.setenv("OPENFF_UTILITIES_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("CONDA_PREFIX", raising=False)
+    monkeypatch.setenv("PIXI_IN_SHELL", "0")
+    monkeypatch.setenv("CONDA_SHLVL", "1")
+    monkeypatch.setenv("CONDA_EXE", str(fake_conda))
+    monkeypatch.setattr("openff.utilities.caching._ENVIRONMENT_FINGERPRINT_REVALIDATE_INTERVAL", 0.0)
+
+    stale: Future = Future()
+    stale.set_result({"ambertools": "22.0"})
+
+    monkeypatch.setattr(openff.utilities.provenance, "_PACKAGE_VERSIONS_FUTURE", stale)
+    monkeypatch.setattr(openff.utilities.provenance, "_PACKAGE_VERSIONS_FINGERPRINT", environment_fingerprint())
+
+    assert asyncio.run(get_ambertools_version_async()) == "22.0"
+
+    # Changing the environment discards the versions listed before, as it does for
+    # `get_ambertools_version`
+    monkeypatch.setenv("PATH", os.pathsep.join([str(tmp_path), os.environ.get("PATH", "")]))
+
+    assert asyncio.run(get_ambertools_version_async()) == "23.6"
+
+    _get_conda_list_package_versions.cache_clear()
+
+
+def test_list_conda_package_versions_async(tmp_path, monkeypatch):
+    fake_conda = tmp_path / "conda"
+    fake_conda.write_text('#!/bin/sh\necho \'{"packages": [{"name": "ambertools", "version": "23.6"}]}\'\n')
+    fake_conda.chmod(0o755)
+
+    monkeypatch.setenv("OPENFF_UTILITIES_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("CONDA_PREFIX", raising=False)
+    monkeypatch.setenv("PIXI_IN_SHELL", "0")
+    monkeypatch.setenv("CONDA_SHLVL", "1")
+    monkeypatch.setenv("CONDA_EXE", str(fake_conda))
+
+    assert asyncio.run(_list_conda_package_versions_async()) == {"ambertools": "23.6"}
+
+
+def test_get_environment_provenance():
+    executables = ["python", "openff-missing-executable"]
+    provenance = get_environment_provenance(executables=executables)
+
+    assert provenance["python"]["executable"] == sys.executable
+    assert "pytest" in provenance["python_packages"]
+    assert provenance["executables"]["python"].startswith("Python")
+    assert provenance["executables"]["openff-missing-executable"] is None
+
+    # The record is cached, but callers receive their own copy
+    provenance["python"]["version"] = "0.0"
+
+    assert get_environment_provenance(executables=executables)["python"]["version"] != "0.0"
+
+    assert json.loads(provenance_to_json(provenance)) == provenance
+    assert provenance_hash() == provenance_hash(get_environment_provenance())
+    assert provenance_hash(provenance) != provenance_hash()
+
+
+def test_diff_provenance():
+    old = {"python": {"version": "3.12.0"}, "conda_packages": {"ambertools": "22.0", "numpy": "1.26"}}
+    new = {"python": {"version": "3.12.0"}, "conda_packages": {"ambertools": "23.6", "rdkit": "2024.03"}}
+
+    assert diff_provenance(old, new) == {
+        "conda_packages.ambertools": ("22.0", "23.6"),
+        "conda_packages.numpy": ("1.26", None),
+        "conda_packages.rdkit": (None, "2024.03"),
+    }
+    assert diff_provenance(old, old) == {}
+
+
+def test_get_executable_versions(tmp_path, monkeypatch):
+    log_path = tmp_path / "calls.log"
+
+    for name, script in [
+        ("openff-fast-tool", f"echo call >> {log_path}\necho 'fast-tool 1.2.3'\necho 'more output'"),
+        ("openff-failing-tool", "exit 1"),
+        ("openff-slow-tool", f"{shutil.which('sleep')} 5"),
+    ]:
+        (tmp_path / name).write_text(f"#!/bin/sh\n{script}\n")
+        (tmp_path / name).chmod(0o755)
+
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    executables = ["openff-fast-tool", "openff-failing-tool", "openff-slow-tool", "openff-missing-tool"]
+
+    for _ in range(2):
+        assert get_executable_versions(executables, timeout=0.5) == {
+            "openff-fast-tool": "fast-tool 1.2.3",
+            "openff-failing-tool": None,
+            "openff-slow-tool": None,
+            "openff-missing-tool": None,
+        }
+
+    # The version of each executable is only requested once
+    assert log_path.read_text().split() == ["call"]
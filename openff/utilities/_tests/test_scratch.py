@@ -0,0 +1,157 @@
+import json
+import os
+import socket
+
+import pytest
+
+from openff.utilities.scratch import ScratchDirectoryPool, deferred_removal_stats, flush_deferred_removals
+from openff.utilities.utilities import scoped_directory, temporary_cd
+
+
+def test_scratch_directory_pool_reuse(tmp_path):
+    pool = ScratchDirectoryPool(root=str(tmp_path), max_size=1)
+
+    with temporary_cd(pool=pool):
+        first_directory = os.getcwd()
+
+        os.mkdir("nested")
+        with open(os.path.join("nested", "output.txt"), "w") as file:
+            file.write("output")
+
+    # The directory is wiped, but not deleted, when it is returned to the pool
+    assert os.path.isdir(first_directory)
+    assert os.listdir(first_directory) == []
+
+    with scoped_directory(pool=pool) as second_directory:
+        assert second_directory == first_directory
+
+        # The pool is empty, so a new directory is created
+        with pool.directory() as third_directory:
+            assert third_directory != first_directory
+
+    # Only one idle directory is kept
+    assert os.listdir(tmp_path) == [os.path.basename(third_directory)]
+
+    pool.clear()
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_scratch_directory_pool_max_age(tmp_path):
+    pool = ScratchDirectoryPool(root=str(tmp_path), max_age=0.0)
+
+    with pool.directory() as first_directory:
+        pass
+
+    with pool.directory() as second_directory:
+        assert second_directory != first_directory
+
+    assert not os.path.exists(first_directory)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+@pytest.mark.filterwarnings("ignore:.*multi-threaded.*fork:DeprecationWarning")
+def test_scratch_directory_pool_fork(tmp_path):
+    pool = ScratchDirectoryPool(root=str(tmp_path))
+
+    with pool.directory() as idle_directory:
+        pass
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        # The child does not reuse the idle directory, which the parent may hand out
+        os.write(write_fd, pool.acquire().encode())
+        os._exit(0)
+
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+
+    with os.fdopen(read_fd) as file:
+        child_directory = file.read()
+
+    assert child_directory != idle_directory
+    assert pool.acquire() == idle_directory
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+@pytest.mark.filterwarnings("ignore:.*multi-threaded.*fork:DeprecationWarning")
+def test_defer_removal_fork(tmp_path):
+    from openff.utilities.scratch import defer_removal
+
+    for index in range(20):
+        (tmp_path / str(index)).mkdir()
+        defer_removal(str(tmp_path / str(index)))
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        # The child does not wait for, or delete, the directories queued by its parent
+        os.write(write_fd, json.dumps([flush_deferred_removals(timeout=3.0), deferred_removal_stats()]).encode())
+        os._exit(0)
+
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+
+    with os.fdopen(read_fd) as file:
+        flushed, stats = json.loads(file.read())
+
+    assert flushed
+    assert stats == {"pending_directories": 0, "pending_bytes": 0, "removed_directories": 0, "removed_bytes": 0}
+    assert flush_deferred_removals(timeout=10.0)
+
+
+def test_scratch_directory_pool_reap_abandoned(tmp_path):
+    hostname = socket.gethostname()
+
+    # A process ID which is all but guaranteed not to be running
+    abandoned = tmp_path / f"openff-scratch-{hostname}-{2**22 + 1}-abcd"
+    in_use = tmp_path / f"openff-scratch-{hostname}-{os.getpid()}-abcd"
+    other_host = tmp_path / f"openff-scratch-not-{hostname}-{2**22 + 1}-abcd"
+
+    for directory in [abandoned, in_use, other_host]:
+        directory.mkdir()
+
+    (abandoned / "output.txt").write_text("output")
+
+    ScratchDirectoryPool(root=str(tmp_path))
+
+    assert not abandoned.exists()
+    assert in_use.exists()
+    assert other_host.exists()
+
+
+def test_temporary_cd_deferred_cleanup():
+    original_directory = os.getcwd()
+    removed_before = deferred_removal_stats()["removed_directories"]
+
+    with temporary_cd(deferred_cleanup=True):
+        directory = os.getcwd()
+
+        with open("output.dat", "wb") as file:
+            file.write(b"0" * 1024)
+
+    assert os.getcwd() == original_directory
+    # The directory is renamed aside straight away
+    assert not os.path.exists(directory)
+
+    assert flush_deferred_removals(timeout=10.0)
+
+    stats = deferred_removal_stats()
+
+    assert stats["pending_directories"] == 0
+    assert stats["pending_bytes"] == 0
+    assert stats["removed_directories"] == removed_before + 1
+    assert stats["removed_bytes"] >= 1024
+
+    assert not any(".openff-trash-" in name for name in os.listdir(os.path.dirname(directory)))
+
+
+def test_deferred_cleanup_with_pool(tmp_path):
+    pool = ScratchDirectoryPool(root=str(tmp_path))
+
+    with pytest.raises(ValueError, match="cannot be combined"):
+        with scoped_directory(pool=pool, deferred_cleanup=True):
+            pass
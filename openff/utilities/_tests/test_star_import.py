@@ -1 +1,20 @@
 from openff.utilities import *  # noqa: F403
+
+
+def test_lazy_imports():
+    import subprocess
+    import sys
+
+    import openff.utilities
+
+    # Importing the package should not import any of its submodules ...
+    script = (
+        "import sys, openff.utilities; "
+        "print(sorted(name for name in sys.modules if name.startswith('openff.utilities.')))"
+    )
+    assert subprocess.check_output([sys.executable, "-c", script], text=True).strip() == "[]"
+
+    # ... but all public names should still be available
+    assert all(hasattr(openff.utilities, name) for name in openff.utilities.__all__)
+    assert set(openff.utilities.__all__) <= set(dir(openff.utilities))
+    assert isinstance(openff.utilities.__version__, str)
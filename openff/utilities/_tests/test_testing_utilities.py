@@ -14,3 +14,65 @@ def test_skips():
 
     with pytest.raises(ValueError, match=r"Bad type.*int"):
         skip_if_missing_exec(0)
+
+
+pytest_plugins = ["pytester"]
+
+
+def _plugin_args(config):
+    # The plugin is already loaded through its entry point when the package is
+    # installed, and loading it again with ``-p`` would register it twice
+    if config.pluginmanager.has_plugin("openff-utilities"):
+        return ()
+
+    return ("-p", "openff.utilities.pytest_plugin")
+
+
+def test_pytest_plugin_persists_capabilities(pytester, pytestconfig, monkeypatch):
+    from openff.utilities import testing
+
+    pytester.makepyfile(
+        """
+        from openff.utilities.testing import skip_if_missing, skip_if_missing_exec
+
+        @skip_if_missing("openff_fake_package")
+        def test_package():
+            pass
+
+        @skip_if_missing_exec("python")
+        def test_executable():
+            pass
+        """
+    )
+
+    monkeypatch.setattr(testing, "_CAPABILITIES", {})
+    pytester.runpytest(*_plugin_args(pytestconfig)).assert_outcomes(passed=1, skipped=1)
+
+    cached = pytester.parseconfigure(*_plugin_args(pytestconfig)).cache.get("openff-utilities/capabilities", None)
+    assert cached["capabilities"] == {"package:openff_fake_package": False, "executable:python": True}
+
+    # Later sessions in the same environment reuse the stored capabilities
+    cached["capabilities"]["package:openff_fake_package"] = True
+    pytester.parseconfigure(*_plugin_args(pytestconfig)).cache.set("openff-utilities/capabilities", cached)
+
+    monkeypatch.setattr(testing, "_CAPABILITIES", {})
+    pytester.runpytest(*_plugin_args(pytestconfig)).assert_outcomes(passed=2)
+
+
+def test_pytest_plugin_worker_capabilities(monkeypatch):
+    from types import SimpleNamespace
+
+    from openff.utilities import pytest_plugin, testing
+
+    monkeypatch.setattr(testing, "_CAPABILITIES", {})
+
+    capabilities = {"package:openff_fake_package": True}
+    worker_config = SimpleNamespace(workerinput={"openff_utilities_capabilities": capabilities})
+    pytest_plugin.pytest_configure(worker_config)
+
+    assert not skip_if_missing("openff_fake_package").args[0]
+
+    worker_config.workeroutput = {}
+    pytest_plugin.pytest_sessionfinish(SimpleNamespace(config=worker_config))
+
+    assert worker_config.workeroutput["openff_utilities_capabilities"] == capabilities
@@ -1,16 +1,31 @@
 import os
+import sys
+import types
 
 import pytest
 
 from openff.utilities.exceptions import MissingOptionalDependencyError
 from openff.utilities.testing import skip_if_missing
 from openff.utilities.utilities import (
+    clear_data_path_cache,
+    clear_executable_cache,
+    clear_package_cache,
+    find_executable,
+    find_executables,
     get_data_dir_path,
     get_data_file_path,
+    get_data_file_paths,
+    get_scoped_directory,
     has_executable,
     has_package,
+    lazy_import,
+    open_data_file,
+    openeye_license_status,
     requires_oe_module,
     requires_package,
+    scoped_directory,
+    scoped_path,
+    scoped_run,
     temporary_cd,
 )
 
@@ -76,6 +91,120 @@ def test_get_data_file_path():
         get_data_file_path("data/", package_name="openff.utilities")
 
 
+def test_get_data_file_paths():
+    assert get_data_file_paths(["data.dat", "more/more.dat"], package_name="openff.utilities") == [
+        get_data_file_path("data.dat", package_name="openff.utilities"),
+        get_data_file_path("data/more/more.dat", package_name="openff.utilities"),
+    ]
+
+    with pytest.raises(FileNotFoundError):
+        get_data_file_paths(["data.dat", "missing.file"], package_name="openff.utilities")
+
+
+def test_open_data_file(tmp_path, monkeypatch):
+    contents = open_data_file("data.dat", package_name="openff.utilities")
+
+    assert contents.readonly
+    assert bytes(contents) == open(get_data_file_path("data.dat", "openff.utilities"), "rb").read()
+    assert open_data_file("data/data.dat", package_name="openff.utilities") is contents
+
+    with pytest.raises(TypeError):
+        contents[0] = 0
+
+    with pytest.raises(FileNotFoundError):
+        open_data_file("missing.file", package_name="openff.utilities")
+
+    package_directory = tmp_path / "openff_empty_data_package"
+    package_directory.mkdir()
+    (package_directory / "__init__.py").write_text("")
+    (package_directory / "empty.dat").write_text("")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    assert bytes(open_data_file("empty.dat", package_name="openff_empty_data_package")) == b""
+
+    # Replacing a file maps it again
+    (package_directory / "replacement.dat").write_text("replaced")
+    os.replace(package_directory / "replacement.dat", package_directory / "empty.dat")
+
+    contents = open_data_file("empty.dat", package_name="openff_empty_data_package")
+    assert bytes(contents) == b"replaced"
+
+    clear_data_path_cache()
+
+    assert open_data_file("empty.dat", package_name="openff_empty_data_package") is not contents
+
+
+def test_get_data_path_index(tmp_path, monkeypatch):
+    package_directory = tmp_path / "openff_data_package"
+    (package_directory / "data").mkdir(parents=True)
+    (package_directory / "__init__.py").write_text("")
+    (package_directory / "data" / "first.dat").write_text("")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    clear_data_path_cache()
+
+    assert compare_paths(
+        get_data_file_path("first.dat", package_name="openff_data_package"),
+        str(package_directory / "data" / "first.dat"),
+    )
+    assert compare_paths(
+        get_data_file_path("./data/../data/first.dat", package_name="openff_data_package"),
+        str(package_directory / "data" / "first.dat"),
+    )
+
+    # Files added after the package was indexed are still found
+    (package_directory / "data" / "second.dat").write_text("")
+    (package_directory / "data" / "third").mkdir()
+
+    assert compare_paths(
+        get_data_file_path("second.dat", package_name="openff_data_package"),
+        str(package_directory / "data" / "second.dat"),
+    )
+    assert compare_paths(
+        get_data_dir_path("third", package_name="openff_data_package"),
+        str(package_directory / "data" / "third"),
+    )
+
+    # Files deleted after the package was indexed are not
+    (package_directory / "data" / "first.dat").unlink()
+
+    with pytest.raises(FileNotFoundError):
+        get_data_file_path("first.dat", package_name="openff_data_package")
+
+    clear_data_path_cache()
+
+
+def test_get_data_file_path_zipped_package(tmp_path, monkeypatch):
+    import zipfile
+
+    archive_path = tmp_path / "packages.zip"
+
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("openff_zipped_package/__init__.py", "")
+        archive.writestr("openff_zipped_package/data/zipped.dat", "zipped contents")
+
+    monkeypatch.syspath_prepend(str(archive_path))
+    monkeypatch.setenv("OPENFF_UTILITIES_CACHE_DIR", str(tmp_path / "cache"))
+    clear_data_path_cache()
+
+    data_file_path = get_data_file_path("zipped.dat", package_name="openff_zipped_package")
+
+    # The extracted file outlives the call, and later lookups reuse it
+    assert data_file_path.startswith((tmp_path / "cache").as_posix())
+    assert open(data_file_path).read() == "zipped contents"
+    assert get_data_file_path("data/zipped.dat", package_name="openff_zipped_package") == data_file_path
+
+    clear_data_path_cache()
+
+    assert get_data_file_path("zipped.dat", package_name="openff_zipped_package") == data_file_path
+
+    with pytest.raises(FileNotFoundError):
+        get_data_file_path("missing.dat", package_name="openff_zipped_package")
+
+    clear_data_path_cache()
+
+
 def test_temporary_cd():
     """Tests that temporary cd works as expected"""
 
@@ -108,12 +237,127 @@ def test_temporary_cd():
     assert compare_paths(os.getcwd(), original_directory)
 
 
+def test_scoped_directory(tmp_path):
+    original_directory = os.getcwd()
+
+    assert compare_paths(get_scoped_directory(), original_directory)
+
+    with scoped_directory(str(tmp_path)) as directory:
+        assert compare_paths(directory, str(tmp_path))
+        assert compare_paths(get_scoped_directory(), str(tmp_path))
+        assert compare_paths(os.getcwd(), original_directory)
+
+        os.mkdir(scoped_path("nested"))
+
+        # Relative paths are resolved against the scoped directory
+        with scoped_directory("nested") as nested_directory:
+            assert compare_paths(nested_directory, str(tmp_path / "nested"))
+
+            with scoped_directory(""):
+                assert compare_paths(get_scoped_directory(), nested_directory)
+
+        assert compare_paths(get_scoped_directory(), str(tmp_path))
+
+        with pytest.raises(NotADirectoryError):
+            with scoped_directory("missing"):
+                pass
+
+    with scoped_directory() as directory:
+        assert not compare_paths(directory, original_directory)
+        assert compare_paths(os.getcwd(), original_directory)
+
+    assert not os.path.exists(directory)
+    assert compare_paths(get_scoped_directory(), original_directory)
+
+
+def test_scoped_directory_concurrent():
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    def work(index):
+        with scoped_directory() as directory:
+            with open(scoped_path("index.txt"), "w") as file:
+                file.write(str(index))
+
+            output = scoped_run(
+                [sys.executable, "-c", "import os; print(os.getcwd()); print(open('index.txt').read())"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split()
+
+            return compare_paths(output[0], directory) and output[1] == str(index)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert all(pool.map(work, range(8)))
+
+    async def task(index):
+        with scoped_directory() as directory:
+            await asyncio.sleep(0.01)
+            return compare_paths(get_scoped_directory(), directory)
+
+    async def main():
+        return await asyncio.gather(*(task(index) for index in range(8)))
+
+    assert all(asyncio.run(main()))
+
+
 def test_has_package():
     assert has_package("os")
     assert has_package("pytest")
     assert not has_package("nummmmmmpy")
 
 
+def test_has_package_probe_does_not_import(tmp_path, monkeypatch):
+    (tmp_path / "openff_noisy_package.py").write_text("raise RuntimeError('imported!')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    clear_package_cache()
+
+    assert has_package("openff_noisy_package")
+    assert "openff_noisy_package" not in sys.modules
+
+    with pytest.raises(RuntimeError, match="imported!"):
+        has_package("openff_noisy_package", level="verify")
+
+
+def test_has_package_verify():
+    assert has_package("json", level="verify")
+    assert not has_package("nummmmmmpy", level="verify")
+    assert not has_package("nummmmmmpy.submodule")
+
+    with pytest.raises(ValueError, match="Unknown level"):
+        has_package("json", level="import")
+
+
+def test_has_package_cache(tmp_path, monkeypatch):
+    clear_package_cache()
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    assert not has_package("openff_late_package")
+
+    (tmp_path / "openff_late_package.py").write_text("")
+
+    # The negative result is cached until explicitly invalidated
+    assert not has_package("openff_late_package")
+
+    clear_package_cache()
+
+    assert has_package("openff_late_package")
+
+
+def test_has_package_cache_environment_changed(tmp_path, monkeypatch):
+    monkeypatch.setattr("openff.utilities.caching._ENVIRONMENT_FINGERPRINT_REVALIDATE_INTERVAL", 0.0)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    assert not has_package("openff_installed_package")
+
+    # Installing a distribution changes the environment fingerprint, which invalidates the cache
+    (tmp_path / "openff_installed_package.py").write_text("")
+    (tmp_path / "openff_installed_package-1.0.dist-info").mkdir()
+
+    assert has_package("openff_installed_package")
+
+
 def test_has_executable():
     assert has_executable("pwd")
     assert has_executable("pytest")
@@ -123,6 +367,73 @@ def test_has_executable():
     assert not has_package("pyyyyython")
 
 
+def _make_executable(path):
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o755)
+
+
+def test_find_executable(tmp_path, monkeypatch):
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+
+    _make_executable(first / "openff-tool")
+    _make_executable(second / "openff-tool")
+    _make_executable(second / "openff-other-tool")
+    (first / "openff-other-tool").write_text("not executable")
+
+    monkeypatch.setenv("PATH", os.pathsep.join([str(first), str(second)]))
+
+    assert find_executable("openff-tool") == str(first / "openff-tool")
+    assert find_executable("openff-other-tool") == str(second / "openff-other-tool")
+    assert find_executable("openff-missing-tool") is None
+    assert find_executable(str(second / "openff-tool")) == str(second / "openff-tool")
+
+    assert find_executables(["openff-tool", "openff-missing-tool"]) == {
+        "openff-tool": str(first / "openff-tool"),
+        "openff-missing-tool": None,
+    }
+
+
+def test_find_executable_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    assert not has_executable("openff-late-tool")
+
+    _make_executable(tmp_path / "openff-late-tool")
+    clear_executable_cache()
+
+    assert has_executable("openff-late-tool")
+
+    # Directories are re-listed once their modification time changes
+    monkeypatch.setattr("openff.utilities.utilities._PATH_INDEX_REVALIDATE_INTERVAL", 0.0)
+
+    assert not has_executable("openff-later-tool")
+
+    _make_executable(tmp_path / "openff-later-tool")
+    os.utime(tmp_path, (0, 0))
+
+    assert has_executable("openff-later-tool")
+
+
+@pytest.mark.skipif(os.name == "nt", reason="file permissions do not decide what is executable")
+def test_find_executable_permissions_changed(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    tool = tmp_path / "openff-tool"
+    tool.write_text("#!/bin/sh\n")
+
+    assert not has_executable("openff-tool")
+
+    # Changing permissions does not change the modification time of the directory, but
+    # is noticed immediately
+    tool.chmod(0o755)
+    assert find_executable("openff-tool") == str(tool)
+
+    tool.chmod(0o644)
+    assert find_executable("openff-tool") is None
+
+
 def test_requires_package():
     """Tests that the ``requires_package`` utility behaves as expected."""
 
@@ -138,6 +449,41 @@ def test_requires_package():
     assert error_info.value.library_name == "fake-lib"
 
 
+def test_requires_package_cached(monkeypatch):
+    """Tests that ``requires_package`` only attempts the import once."""
+    import importlib
+
+    clear_package_cache()
+
+    calls = []
+    import_module = importlib.import_module
+
+    def counting_import_module(name, *args, **kwargs):
+        calls.append(name)
+        return import_module(name, *args, **kwargs)
+
+    monkeypatch.setattr(importlib, "import_module", counting_import_module)
+
+    def dummy_function(value):
+        return value
+
+    found = requires_package("json")(dummy_function)
+    missing = requires_package("fake-lib")(dummy_function)
+
+    assert [found(i) for i in range(3)] == [0, 1, 2]
+
+    for _ in range(3):
+        with pytest.raises(MissingOptionalDependencyError):
+            missing(0)
+
+    assert calls == ["json", "fake-lib"]
+
+    clear_package_cache()
+    found(0)
+
+    assert calls == ["json", "fake-lib", "json"]
+
+
 @skip_if_missing("openeye.oechem")
 @pytest.mark.skipif("OE_LICENSE" not in os.environ, reason="Requires an OpenEye license is NOT set up")
 def test_requires_oe_module():
@@ -179,3 +525,101 @@ def test_requires_oe_module_not_installed():
 
     assert "oechem" in str(error_info.value)
     assert "conda-forge" not in str(error_info.value)
+
+
+@pytest.fixture
+def fake_openeye(monkeypatch):
+    """Replace the OpenEye toolkits with a fake in which only OEChem is licensed and
+    which counts how often each license is checked."""
+    license_checks = []
+
+    monkeypatch.setitem(sys.modules, "openeye", types.ModuleType("openeye"))
+
+    for module_name, function_name, is_licensed in [
+        ("oechem", "OEChemIsLicensed", True),
+        ("oeomega", "OEOmegaIsLicensed", False),
+        ("oequacpac", "OEQuacPacIsLicensed", False),
+    ]:
+        oe_module = types.ModuleType(f"openeye.{module_name}")
+
+        def license_function(module_name=module_name, is_licensed=is_licensed):
+            license_checks.append(module_name)
+            return is_licensed
+
+        setattr(oe_module, function_name, license_function)
+        monkeypatch.setitem(sys.modules, f"openeye.{module_name}", oe_module)
+
+    for module_name in ["oeiupac", "oedepict"]:
+        monkeypatch.setitem(sys.modules, f"openeye.{module_name}", None)
+
+    clear_package_cache()
+    yield license_checks
+    clear_package_cache()
+
+
+def test_requires_oe_module_license_cached(fake_openeye):
+    def dummy_function():
+        return True
+
+    licensed = requires_oe_module("oechem")(dummy_function)
+    unlicensed = requires_oe_module("oeomega")(dummy_function)
+
+    assert all(licensed() for _ in range(3))
+
+    for _ in range(3):
+        with pytest.raises(MissingOptionalDependencyError, match="missing license"):
+            unlicensed()
+
+    assert fake_openeye == ["oechem", "oeomega"]
+
+    requires_oe_module("oechem", license_ttl=0)(dummy_function)()
+
+    assert fake_openeye == ["oechem", "oeomega", "oechem"]
+
+
+def test_openeye_license_status(fake_openeye):
+    assert openeye_license_status() == {
+        "oechem": True,
+        "oequacpac": False,
+        "oeiupac": False,
+        "oeomega": False,
+        "oedepict": False,
+    }
+
+    openeye_license_status()
+
+    assert sorted(fake_openeye) == ["oechem", "oeomega", "oequacpac"]
+
+
+def test_lazy_import(tmp_path, monkeypatch):
+    (tmp_path / "openff_lazy_module.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "openff_lazy_module", raising=False)
+
+    lazy_module = lazy_import("openff_lazy_module")
+
+    assert "openff_lazy_module" not in sys.modules
+    assert "not yet loaded" in repr(lazy_module)
+
+    assert lazy_module.VALUE == 1
+    assert "openff_lazy_module" in sys.modules
+    assert "VALUE" in dir(lazy_module)
+
+    missing_module = lazy_import("openff_missing_module")
+
+    with pytest.raises(MissingOptionalDependencyError) as error_info:
+        missing_module.VALUE
+
+    assert error_info.value.library_name == "openff_missing_module"
+
+
+def test_lazy_import_openeye(fake_openeye):
+    assert callable(lazy_import("openeye.oechem").OEChemIsLicensed)
+
+    with pytest.raises(MissingOptionalDependencyError, match="missing license"):
+        lazy_import("openeye.oeomega").OEOmegaIsLicensed
+
+    with pytest.raises(MissingOptionalDependencyError) as error_info:
+        lazy_import("openeye.oeiupac").OEIUPACIsLicensed
+
+    assert not error_info.value.license_issue
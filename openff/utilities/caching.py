@@ -0,0 +1,429 @@
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Generator, Iterable
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def get_cache_dir(*subdirectories: str) -> str:
+    """
+    Return (and create) the directory in which openff-utilities persists caches.
+
+    The directory is taken from the ``OPENFF_UTILITIES_CACHE_DIR`` environment variable
+    if it is set, and otherwise defaults to ``openff-utilities`` within the user's cache
+    directory (``$XDG_CACHE_HOME``, ``~/.cache`` or ``%LOCALAPPDATA%``).
+
+    Parameters
+    ----------
+    subdirectories: str
+        The names of any nested directories within the cache directory to return.
+
+    Returns
+    -------
+        The absolute path to the cache directory.
+    """
+    cache_root = os.environ.get("OPENFF_UTILITIES_CACHE_DIR")
+
+    if not cache_root:
+        if sys.platform == "win32":
+            user_cache = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+        else:
+            user_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+
+        cache_root = os.path.join(user_cache, "openff-utilities")
+
+    cache_dir = os.path.abspath(os.path.join(cache_root, *subdirectories))
+    os.makedirs(cache_dir, exist_ok=True)
+
+    return cache_dir
+
+
+def atomic_write(file_path: str, contents: bytes) -> None:
+    """
+    Write a file such that other processes either see its previous contents or all of
+    its new contents, but never a partially written file.
+
+    Parameters
+    ----------
+    file_path: str
+        The path to write to. Its parent directory is created if needed.
+    contents: bytes
+        The contents of the file.
+    """
+    directory_path = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory_path, exist_ok=True)
+
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=directory_path, prefix=".tmp-")
+
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(contents)
+
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temporary_path)
+        except OSError:
+            pass
+
+        raise
+
+
+def evict_least_recently_used(directory_path: str, max_bytes: int) -> int:
+    """
+    Delete the least recently used files within a directory tree until the files which
+    remain take up no more than ``max_bytes``.
+
+    Files are ordered by their modification time, so callers should update it (e.g. with
+    `os.utime`) when a cached file is used.
+
+    Parameters
+    ----------
+    directory_path: str
+        The directory to prune.
+    max_bytes: int
+        The maximum total size of the files to keep.
+
+    Returns
+    -------
+        The number of files which were deleted.
+    """
+    cached_files = []
+
+    for parent, _, file_names in os.walk(directory_path):
+        for file_name in file_names:
+            file_path = os.path.join(parent, file_name)
+
+            try:
+                stat_result = os.stat(file_path)
+            except OSError:
+                continue
+
+            cached_files.append((stat_result.st_mtime, stat_result.st_size, file_path))
+
+    total_bytes = sum(size for _, size, _ in cached_files)
+    evicted = 0
+
+    for _, size, file_path in sorted(cached_files):
+        if total_bytes <= max_bytes:
+            break
+
+        try:
+            os.unlink(file_path)
+        except OSError:
+            continue
+
+        total_bytes -= size
+        evicted += 1
+
+    return evicted
+
+
+@contextmanager
+def file_lock(lock_path: str) -> Generator[None, None, None]:
+    """
+    Hold an exclusive lock on a file, blocking until any other process holding it
+    releases it. The lock file is created if it does not already exist.
+
+    Parameters
+    ----------
+    lock_path: str
+        The path to the lock file.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+
+    with open(lock_path, "a+b") as lock_file:
+        if sys.platform == "win32":
+            import msvcrt
+
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+# The number of seconds for which `environment_fingerprint` is reused without checking
+# whether the installed packages or executables have changed
+_ENVIRONMENT_FINGERPRINT_REVALIDATE_INTERVAL = 1.0
+
+# The names of files in a directory on `sys.path` which record installed distributions
+_DISTRIBUTION_METADATA_SUFFIXES = (".dist-info", ".egg-info", ".egg-link", ".pth")
+
+# A digest of the distribution metadata in each directory on `sys.path`, alongside the
+# mtime of the directory when it was listed, so that only directories which have changed
+# are listed again
+_SITE_DIRECTORY_DIGESTS: dict[str, tuple[int, str]] = {}
+
+# The last fingerprint computed, alongside the time.monotonic() at which it was computed
+# and the `sys.path` and ``PATH`` it was computed for
+_ENVIRONMENT_FINGERPRINT: tuple[float, list[str], str | None, str] | None = None
+_ENVIRONMENT_FINGERPRINT_LOCK = threading.Lock()
+
+
+def _get_site_directory_digest(directory_path: str) -> str:
+    """A digest of the names of the distributions installed in a directory on `sys.path`.
+
+    Only the names of metadata files are used, rather than the mtime of the directory, so
+    that other changes (e.g. to a source checkout) do not alter the digest.
+    """
+    try:
+        modified_time = os.stat(directory_path).st_mtime_ns
+    except OSError:
+        return "missing"
+
+    cached = _SITE_DIRECTORY_DIGESTS.get(directory_path)
+
+    if cached is not None and cached[0] == modified_time:
+        return cached[1]
+
+    try:
+        file_names = sorted(
+            file_name
+            for file_name in os.listdir(directory_path)
+            if file_name.endswith(_DISTRIBUTION_METADATA_SUFFIXES)
+        )
+    except NotADirectoryError:
+        # e.g. a zip file, which changes whenever its contents do
+        file_names = [str(modified_time)]
+    except OSError:
+        file_names = []
+
+    digest = hashlib.sha256("\0".join(file_names).encode()).hexdigest()
+    _SITE_DIRECTORY_DIGESTS[directory_path] = (modified_time, digest)
+
+    return digest
+
+
+def _get_conda_meta_directories() -> list[str]:
+    """The ``conda-meta`` directories of the environment containing the interpreter and
+    of the active conda (or pixi) environment."""
+    prefixes = [sys.prefix]
+
+    if os.environ.get("CONDA_PREFIX"):
+        prefixes.append(os.environ["CONDA_PREFIX"])
+
+    return [os.path.join(os.path.abspath(prefix), "conda-meta") for prefix in dict.fromkeys(prefixes)]
+
+
+def environment_fingerprint() -> str:
+    """
+    Return a short string which changes whenever the software environment changes.
+
+    The fingerprint covers the Python interpreter, the distributions installed in each
+    absolute directory on `sys.path` (from their ``.dist-info`` and similar metadata,
+    while relative entries such as ``""`` are only included by name), the
+    modification times of the ``conda-meta`` directories of the interpreter's and the
+    active conda environment, and the directories on ``PATH`` and (for absolute
+    directories) their modification times. Results computed from the environment can be cached alongside it, and
+    recomputed when it changes.
+
+    The fingerprint is memoized: it is only recomputed when `sys.path` or ``PATH`` change,
+    or when it is more than a second old, and even then only the directories on
+    `sys.path` which have been modified are listed again.
+
+    Returns
+    -------
+        A 16 character hexadecimal string.
+    """
+    global _ENVIRONMENT_FINGERPRINT
+
+    memoized = _ENVIRONMENT_FINGERPRINT
+    path = os.environ.get("PATH")
+
+    if (
+        memoized is not None
+        and time.monotonic() - memoized[0] < _ENVIRONMENT_FINGERPRINT_REVALIDATE_INTERVAL
+        and memoized[1] == sys.path
+        and memoized[2] == path
+    ):
+        return memoized[3]
+
+    with _ENVIRONMENT_FINGERPRINT_LOCK:
+        computed_at, python_path = time.monotonic(), list(sys.path)
+
+        fingerprint = hashlib.sha256(f"{sys.executable}\0{sys.version}\0".encode())
+
+        for directory_path in python_path:
+            if not os.path.isabs(directory_path):
+                # Relative entries (e.g. the ``""`` added by ``python -c`` and Jupyter)
+                # are keyed literally, so that changing directory does not change the
+                # fingerprint
+                fingerprint.update(f"{directory_path}\0".encode())
+                continue
+
+            fingerprint.update(f"{directory_path}\0{_get_site_directory_digest(directory_path)}\0".encode())
+
+        for directory_path in [*_get_conda_meta_directories(), *(path or "").split(os.pathsep)]:
+            if not os.path.isabs(directory_path):
+                # As for `sys.path`, relative entries (e.g. ``.``) are keyed literally
+                fingerprint.update(f"{directory_path}\0".encode())
+                continue
+
+            try:
+                modified_time = os.stat(directory_path).st_mtime_ns
+            except OSError:
+                modified_time = -1
+
+            fingerprint.update(f"{directory_path}\0{modified_time}\0".encode())
+
+        _ENVIRONMENT_FINGERPRINT = (computed_at, python_path, path, fingerprint.hexdigest()[:16])
+
+        return _ENVIRONMENT_FINGERPRINT[3]
+
+
+# The fraction of its maximum size which can be written to a `disk_memoize` cache
+# before the cache is checked for files to evict
+_MEMOIZE_EVICTION_FRACTION = 0.1
+
+
+def disk_memoize(
+    name: str | None = None,
+    packages: Iterable[str] = (),
+    executables: Iterable[str] = (),
+    max_bytes: int = 1024**3,
+) -> Callable[[F], F]:
+    """
+    Decorate a deterministic function so that its results are cached on disk, and
+    shared between processes and runs.
+
+    Results are stored (pickled) in a directory of the `get_cache_dir`, one file per
+    call, keyed by a hash of the function's arguments and of the versions of the
+    ``packages`` and ``executables`` it depends on, so that upgrading any of them means
+    results are computed afresh rather than reused. Files are written atomically, so
+    any number of processes can share a cache, and the least recently used results
+    are deleted once the cache grows beyond ``max_bytes``.
+
+    Arguments and results must be picklable, and arguments which are equal must pickle
+    to the same bytes. Exceptions are not cached.
+
+    Parameters
+    ----------
+    name: str, optional
+        The name of the cache, which defaults to the qualified name of the function.
+        Changing it (e.g. to include a version) discards every cached result, such as
+        after the implementation of the function changes.
+    packages: iterable of str
+        The names of the Python distributions or conda packages (e.g.
+        ``"openeye-toolkits"`` or ``"ambertools"``) whose versions the results depend on.
+    executables: iterable of str
+        The names of the executables (e.g. ``"antechamber"``) whose versions the
+        results depend on.
+    max_bytes: int
+        The maximum total size of the cached results.
+
+    Examples
+    --------
+    >>> @disk_memoize(packages=["ambertools"], executables=["antechamber"])
+    ... def assign_am1bcc_charges(smiles: str) -> list[float]:
+    ...     ...
+    """
+    packages = sorted(set(packages))
+    executables = sorted(set(executables))
+
+    def decorator(function: F) -> F:
+        import inspect
+        import pickle
+
+        signature = inspect.signature(function)
+        cache_name = name or f"{function.__module__}.{function.__qualname__}"
+
+        lock = threading.Lock()
+        # The `environment_fingerprint` which the dependency versions were found in, the
+        # pickled versions, and the number of bytes written since the cache was last
+        # checked for files to evict (initially large, so the first write checks it)
+        state: dict[str, Any] = {"fingerprint": None, "versions": b"", "bytes_written": max_bytes}
+
+        def _get_versions() -> bytes:
+            from openff.utilities.provenance import _get_dependency_versions
+
+            fingerprint = environment_fingerprint()
+
+            with lock:
+                if state["fingerprint"] != fingerprint:
+                    versions = _get_dependency_versions(packages, executables)
+
+                    state["versions"] = pickle.dumps(versions, protocol=pickle.HIGHEST_PROTOCOL)
+                    state["fingerprint"] = fingerprint
+
+                versions_key: bytes = state["versions"]
+
+                return versions_key
+
+        def _store(cache_dir: str, cache_path: str, contents: bytes) -> None:
+            atomic_write(cache_path, contents)
+
+            with lock:
+                state["bytes_written"] += len(contents)
+
+                if state["bytes_written"] < max_bytes * _MEMOIZE_EVICTION_FRACTION:
+                    return
+
+                state["bytes_written"] = 0
+
+            with file_lock(f"{cache_dir}.lock"):
+                evict_least_recently_used(cache_dir, max_bytes)
+
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+
+            key = hashlib.sha256(_get_versions())
+            key.update(pickle.dumps(bound.arguments, protocol=pickle.HIGHEST_PROTOCOL))
+            digest = key.hexdigest()
+
+            try:
+                cache_dir = get_cache_dir("memoize", cache_name)
+            except OSError:
+                return function(*args, **kwargs)
+
+            cache_path = os.path.join(cache_dir, digest[:2], f"{digest}.pkl")
+
+            try:
+                with open(cache_path, "rb") as file:
+                    result = pickle.load(file)
+            except Exception:
+                # The result has not been cached, or cannot be loaded (e.g. its class has
+                # since changed), so it is computed afresh
+                pass
+            else:
+                try:
+                    os.utime(cache_path)
+                except OSError:
+                    pass
+
+                return result
+
+            result = function(*args, **kwargs)
+
+            try:
+                _store(cache_dir, cache_path, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+            except OSError:
+                pass
+
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
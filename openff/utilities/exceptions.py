@@ -45,6 +45,11 @@ class MissingOptionalDependencyError(OpenFFError, ImportError):
         self.library_name = library_name
         self.license_issue = license_issue
 
+    def __reduce__(self) -> tuple[type["MissingOptionalDependencyError"], tuple[str, bool]]:
+        # Recreate the error from its attributes rather than its message, e.g. when it is
+        # raised in a worker process and sent back to the parent
+        return type(self), (self.library_name, self.license_issue)
+
 
 class CondaExecutableNotFoundError(OpenFFError):
     """
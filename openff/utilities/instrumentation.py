@@ -0,0 +1,200 @@
+"""
+Named timers and counters recording where openff-utilities spends its time, e.g. in
+dependency checks, license calls, ``PATH`` scans, data-path lookups, temporary
+directories and ``conda list``.
+
+Instrumentation is disabled by default, in which case each instrumented call only
+checks `ENABLED`. It can be enabled with `enable_instrumentation`, or by setting the
+``OPENFF_UTILITIES_INSTRUMENTATION`` environment variable to ``1`` (which also enables
+it in worker processes).
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Generator, Iterable
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Any
+
+ENABLED = os.environ.get("OPENFF_UTILITIES_INSTRUMENTATION") == "1"
+
+# name -> number of times incremented
+_COUNTERS: dict[str, int] = {}
+# name -> [number of timed calls, total seconds, longest call in seconds]
+_TIMERS: dict[str, list[float]] = {}
+_LOCK = threading.Lock()
+
+_DISABLED_TIMER: AbstractContextManager[None] = nullcontext()
+
+
+def enable_instrumentation(enabled: bool = True) -> None:
+    """
+    Start (or, with ``enabled=False``, stop) recording timers and counters in this
+    process. Statistics which have already been recorded are kept.
+    """
+    global ENABLED
+
+    ENABLED = enabled
+
+
+def reset_instrumentation() -> None:
+    """Discard every timer and counter recorded in this process."""
+    with _LOCK:
+        _COUNTERS.clear()
+        _TIMERS.clear()
+
+
+def increment(name: str, amount: int = 1) -> None:
+    """Add to a named counter, if instrumentation is enabled."""
+    if not ENABLED:
+        return
+
+    with _LOCK:
+        _COUNTERS[name] = _COUNTERS.get(name, 0) + amount
+
+
+@contextmanager
+def _timer(name: str) -> Generator[None, None, None]:
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+
+        with _LOCK:
+            timer = _TIMERS.setdefault(name, [0, 0.0, 0.0])
+            timer[0] += 1
+            timer[1] += elapsed
+            timer[2] = max(timer[2], elapsed)
+
+
+def timer(name: str) -> AbstractContextManager[None]:
+    """
+    Time the body of a ``with`` block under a name, if instrumentation is enabled.
+
+    Examples
+    --------
+    >>> with timer("my_package.charge_assignment"):
+    ...     assign_charges(molecule)
+    """
+    if not ENABLED:
+        return _DISABLED_TIMER
+
+    return _timer(name)
+
+
+def get_instrumentation_stats() -> dict[str, Any]:
+    """
+    Return the timers and counters recorded in this process.
+
+    Returns
+    -------
+        A JSON-serializable dictionary with the process ID (``"pids"``), the value of
+        each counter (``"counters"``) and, for each timer (``"timers"``), the number of
+        timed calls (``"count"``) and the total and longest duration of the calls in
+        seconds (``"total"`` and ``"max"``). Statistics from several processes can be
+        combined with `merge_instrumentation_stats`.
+    """
+    with _LOCK:
+        return {
+            "pids": [os.getpid()],
+            "counters": dict(sorted(_COUNTERS.items())),
+            "timers": {
+                name: {"count": int(count), "total": total, "max": longest}
+                for name, (count, total, longest) in sorted(_TIMERS.items())
+            },
+        }
+
+
+def merge_instrumentation_stats(stats: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Combine statistics from `get_instrumentation_stats`, e.g. collected from several
+    worker processes, by summing the counters and timers.
+    """
+    merged: dict[str, Any] = {"pids": [], "counters": {}, "timers": {}}
+
+    for process_stats in stats:
+        merged["pids"].extend(process_stats.get("pids", []))
+
+        for name, value in process_stats.get("counters", {}).items():
+            merged["counters"][name] = merged["counters"].get(name, 0) + value
+
+        for name, timer_stats in process_stats.get("timers", {}).items():
+            merged_timer = merged["timers"].setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            merged_timer["count"] += timer_stats["count"]
+            merged_timer["total"] += timer_stats["total"]
+            merged_timer["max"] = max(merged_timer["max"], timer_stats["max"])
+
+    merged["pids"] = sorted(set(merged["pids"]))
+    merged["counters"] = dict(sorted(merged["counters"].items()))
+    merged["timers"] = dict(sorted(merged["timers"].items()))
+
+    return merged
+
+
+def _add_instrumentation_stats(stats: dict[str, Any]) -> None:
+    """Add statistics recorded by another process to those of this process."""
+    with _LOCK:
+        for name, value in stats.get("counters", {}).items():
+            _COUNTERS[name] = _COUNTERS.get(name, 0) + value
+
+        for name, timer_stats in stats.get("timers", {}).items():
+            timer = _TIMERS.setdefault(name, [0, 0.0, 0.0])
+            timer[0] += timer_stats["count"]
+            timer[1] += timer_stats["total"]
+            timer[2] = max(timer[2], timer_stats["max"])
+
+
+def dump_instrumentation_stats(file_path: str | None = None) -> str:
+    """
+    Serialize the statistics recorded in this process to JSON.
+
+    Parameters
+    ----------
+    file_path: str, optional
+        A file to also write the JSON to.
+
+    Returns
+    -------
+        The output of `get_instrumentation_stats`, as JSON.
+    """
+    serialized = json.dumps(get_instrumentation_stats(), indent=2)
+
+    if file_path is not None:
+        with open(file_path, "w") as file:
+            file.write(serialized)
+
+    return serialized
+
+
+def instrumentation_summary(stats: dict[str, Any] | None = None) -> str:
+    """
+    Format statistics as a human-readable table, with the slowest timers first.
+
+    Parameters
+    ----------
+    stats
+        The statistics to format. Defaults to those recorded in this process.
+    """
+    if stats is None:
+        stats = get_instrumentation_stats()
+
+    lines = [f"{'timer':<40} {'count':>10} {'total (s)':>12} {'mean (ms)':>12} {'max (ms)':>12}"]
+
+    for name, timer_stats in sorted(stats["timers"].items(), key=lambda item: -item[1]["total"]):
+        mean = timer_stats["total"] / timer_stats["count"] if timer_stats["count"] else 0.0
+
+        lines.append(
+            f"{name:<40} {timer_stats['count']:>10} {timer_stats['total']:>12.6f} "
+            f"{mean * 1000:>12.3f} {timer_stats['max'] * 1000:>12.3f}"
+        )
+
+    lines.append("")
+    lines.append(f"{'counter':<40} {'count':>10}")
+
+    for name, value in stats["counters"].items():
+        lines.append(f"{name:<40} {value:>10}")
+
+    return "\n".join(lines)
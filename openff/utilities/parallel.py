@@ -0,0 +1,227 @@
+import os
+import shutil
+import tempfile
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from openff.utilities import instrumentation
+from openff.utilities.exceptions import MissingOptionalDependencyError
+from openff.utilities.utilities import (
+    _OPENEYE_LICENSE_FUNCTIONS,
+    _SCOPED_DIRECTORY,
+    _import_required_package,
+    _is_openeye_module_licensed,
+)
+
+if TYPE_CHECKING:
+    from multiprocessing.context import BaseContext
+
+# The error raised while importing the dependencies of a worker process, which is
+# raised again by each task the worker is given
+_WORKER_ERROR: MissingOptionalDependencyError | None = None
+
+
+def _check_dependencies(packages: Iterable[str], oe_modules: Iterable[str]) -> None:
+    """Import each package and OpenEye module, as `requires_package` and
+    `requires_oe_module` would, raising `MissingOptionalDependencyError` if any is
+    missing or unlicensed."""
+    for package_name in packages:
+        if not _import_required_package(package_name):
+            raise MissingOptionalDependencyError(library_name=package_name)
+
+    for module_name in oe_modules:
+        if not _import_required_package(f"openeye.{module_name}"):
+            raise MissingOptionalDependencyError(library_name=f"openeye.{module_name}")
+
+        if not _is_openeye_module_licensed(module_name, license_ttl=None):
+            raise MissingOptionalDependencyError(library_name=f"openeye.{module_name}", license_issue=True)
+
+
+def _initialize_worker(
+    packages: list[str],
+    oe_modules: list[str],
+    scratch_root: str,
+    instrumentation_enabled: bool,
+) -> None:
+    global _WORKER_ERROR
+
+    instrumentation.enable_instrumentation(instrumentation_enabled)
+    instrumentation.reset_instrumentation()
+
+    directory_path = tempfile.mkdtemp(prefix="worker-", dir=scratch_root)
+
+    os.chdir(directory_path)
+    _SCOPED_DIRECTORY.set(directory_path)
+
+    try:
+        _check_dependencies(packages, oe_modules)
+    except MissingOptionalDependencyError as error:
+        # Raising here would break the whole pool, so the error is instead raised by
+        # each task, and so reaches the caller unchanged
+        _WORKER_ERROR = error
+
+
+def _run_chunk(function: Callable[[Any], Any], items: list[Any]) -> tuple[list[Any], dict[str, Any] | None]:
+    """Apply a function to a chunk of items, returning the results alongside any
+    instrumentation recorded since the previous chunk."""
+    if _WORKER_ERROR is not None:
+        raise _WORKER_ERROR
+
+    results = [function(item) for item in items]
+
+    if not instrumentation.ENABLED:
+        return results, None
+
+    stats = instrumentation.get_instrumentation_stats()
+    instrumentation.reset_instrumentation()
+
+    return results, stats
+
+
+def parallel_map(
+    function: Callable[[Any], Any],
+    iterable: Iterable[Any],
+    packages: Iterable[str] = (),
+    oe_modules: Iterable[str] = (),
+    max_workers: int | None = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+    mp_context: "BaseContext | None" = None,
+) -> Iterator[Any]:
+    """
+    Apply a function to each item of an iterable using a pool of worker processes.
+
+    The ``packages`` and ``oe_modules`` which ``function`` needs (e.g. through
+    `requires_package` and `requires_oe_module`) are checked once, before any work is
+    started, and are imported by each worker when it starts so that tasks do not pay
+    for the imports. Each worker runs in its own scratch directory, which is both its
+    working directory and its `get_scoped_directory`, so that files written by tasks
+    on different workers cannot clash. The scratch directories are deleted once every
+    result has been returned. If instrumentation is enabled (see
+    `openff.utilities.instrumentation`), the statistics recorded by the workers are
+    added to those of this process.
+
+    Items are sent to the workers in chunks of ``chunksize``, and results are returned
+    as they become available, so only a bounded number of items are held in memory
+    at once.
+
+    Parameters
+    ----------
+    function
+        The function to apply, which must be picklable (e.g. defined at the top level
+        of a module).
+    iterable
+        The items to apply the function to.
+    packages
+        The names of the Python packages which ``function`` requires.
+    oe_modules
+        The OpenEye modules (e.g. ``"oechem"``) which ``function`` requires.
+    max_workers
+        The number of worker processes. Defaults to the number of CPUs.
+    chunksize
+        The number of items sent to a worker at a time.
+    ordered
+        Whether to return results in the order of ``iterable``, rather than as soon as
+        they are computed.
+    mp_context
+        The `multiprocessing` context used to start workers.
+
+    Returns
+    -------
+        An iterator over the results.
+
+    Raises
+    ------
+    MissingOptionalDependencyError
+        If any of the ``packages`` or ``oe_modules`` is missing (or unlicensed), either
+        when this function is called or, if a worker cannot import it, when the results
+        are iterated over.
+    """
+    packages = list(packages)
+    oe_modules = list(oe_modules)
+
+    for module_name in oe_modules:
+        if module_name not in _OPENEYE_LICENSE_FUNCTIONS:
+            raise ValueError(
+                f"Unknown OpenEye module {module_name!r}. Expected one of {sorted(_OPENEYE_LICENSE_FUNCTIONS)}."
+            )
+
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    _check_dependencies(packages, oe_modules)
+
+    return _parallel_map(
+        function, iterable, packages, oe_modules, max_workers or os.cpu_count() or 1, chunksize, ordered, mp_context
+    )
+
+
+def _parallel_map(
+    function: Callable[[Any], Any],
+    iterable: Iterable[Any],
+    packages: list[str],
+    oe_modules: list[str],
+    max_workers: int,
+    chunksize: int,
+    ordered: bool,
+    mp_context: "BaseContext | None",
+) -> Generator[Any, None, None]:
+    scratch_root = tempfile.mkdtemp(prefix="openff-parallel-")
+
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=mp_context,
+        initializer=_initialize_worker,
+        initargs=(packages, oe_modules, scratch_root, instrumentation.ENABLED),
+    )
+
+    # Keep every worker busy, with a chunk waiting for each, without reading the whole
+    # iterable up front
+    max_pending = 2 * max_workers
+
+    iterator = iter(iterable)
+    chunks = iter(lambda: list(islice(iterator, chunksize)), [])
+
+    pending_ordered: deque[Future[tuple[list[Any], dict[str, Any] | None]]] = deque()
+    pending_unordered: set[Future[tuple[list[Any], dict[str, Any] | None]]] = set()
+
+    def _results(future: Future[tuple[list[Any], dict[str, Any] | None]]) -> list[Any]:
+        results, stats = future.result()
+
+        if stats is not None:
+            instrumentation._add_instrumentation_stats(stats)
+
+        return results
+
+    def _completed() -> Generator[Any, None, None]:
+        nonlocal pending_unordered
+
+        if ordered:
+            yield from _results(pending_ordered.popleft())
+            return
+
+        done, pending_unordered = wait(pending_unordered, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            yield from _results(future)
+
+    try:
+        for chunk in chunks:
+            future = executor.submit(_run_chunk, function, chunk)
+
+            if ordered:
+                pending_ordered.append(future)
+            else:
+                pending_unordered.add(future)
+
+            if len(pending_ordered) + len(pending_unordered) >= max_pending:
+                yield from _completed()
+
+        while pending_ordered or pending_unordered:
+            yield from _completed()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        shutil.rmtree(scratch_root, ignore_errors=True)
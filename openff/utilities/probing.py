@@ -0,0 +1,396 @@
+import atexit
+import dataclasses
+import json
+import os
+import subprocess
+import sys
+import threading
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from openff.utilities.utilities import (
+    _OPENEYE_LICENSE_FUNCTIONS,
+    _PACKAGE_CACHE,
+    _is_openeye_module_licensed,
+    find_executables,
+    has_package,
+)
+
+
+@dataclasses.dataclass
+class CapabilityReport:
+    """The optional dependencies found by `probe_environment`.
+
+    Attributes
+    ----------
+    packages
+        Whether each Python package is available.
+    executables
+        The absolute path to each executable, or ``None`` if it could not be found.
+    oe_modules
+        Whether each OpenEye module is importable and licensed.
+    """
+
+    packages: dict[str, bool] = dataclasses.field(default_factory=dict)
+    executables: dict[str, str | None] = dataclasses.field(default_factory=dict)
+    oe_modules: dict[str, bool] = dataclasses.field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the report as a JSON-serializable dictionary."""
+        return dataclasses.asdict(self)
+
+
+@dataclasses.dataclass
+class ImportProbeResult:
+    """The outcome of importing a package in a separate process with `probe_import`.
+
+    Attributes
+    ----------
+    package_name
+        The name of the package.
+    importable
+        Whether the package was imported successfully.
+    import_time
+        The number of seconds the import took, or ``None`` if it did not finish.
+    memory
+        The increase, in bytes, of the peak memory use of the process caused by the
+        import, or ``None`` if it did not finish or could not be measured.
+    error
+        A description of why the import failed, if it did.
+    """
+
+    package_name: str
+    importable: bool
+    import_time: float | None = None
+    memory: int | None = None
+    error: str | None = None
+
+
+# Run by each helper process. Requests (a package name, a timeout and the caller's
+# `sys.path`) are read from stdin one JSON line at a time. Each import is performed in a forked child, so that imports
+# do not affect one another and a crash or hang only loses the child, and the result is
+# written to stdout as a single JSON line.
+_HELPER_SCRIPT = """
+import importlib, json, os, select, signal, sys, time
+
+def max_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+def probe(package_name, path):
+    sys.path[:] = path
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    rss_before, start = max_rss(), time.perf_counter()
+    try:
+        importlib.import_module(package_name)
+        result = {"importable": True, "error": None}
+    except BaseException as error:
+        result = {"importable": False, "error": f"{type(error).__name__}: {error}"}
+    result["import_time"] = time.perf_counter() - start
+    rss_after = max_rss()
+    result["memory"] = None if rss_before is None else rss_after - rss_before
+    return result
+
+for line in sys.stdin:
+    package_name, timeout, path = json.loads(line)
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            os.write(write_fd, json.dumps(probe(package_name, path)).encode())
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    timed_out = not select.select([read_fd], [], [], timeout)[0]
+    if timed_out:
+        os.kill(pid, signal.SIGKILL)
+    chunks = []
+    while not timed_out:
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.close(read_fd)
+    _, status = os.waitpid(pid, 0)
+    if chunks:
+        result = json.loads(b"".join(chunks))
+    elif timed_out:
+        result = {"importable": False, "error": f"Import timed out after {timeout} s"}
+    elif os.WIFSIGNALED(status):
+        result = {"importable": False, "error": f"Import crashed with signal {os.WTERMSIG(status)}"}
+    else:
+        result = {"importable": False, "error": f"Import exited with status {os.WEXITSTATUS(status)}"}
+    sys.stdout.write(json.dumps(result) + "\\n")
+    sys.stdout.flush()
+"""
+
+
+class _ImportProbeHelper:
+    """A long-lived Python process which performs imports on request."""
+
+    def __init__(self) -> None:
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", _HELPER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+
+    def probe(self, package_name: str, timeout: float) -> dict[str, Any]:
+        assert self.process.stdin is not None and self.process.stdout is not None
+
+        try:
+            self.process.stdin.write(json.dumps([package_name, timeout, sys.path]) + "\n")
+            self.process.stdin.flush()
+
+            response = self.process.stdout.readline()
+        except OSError:
+            response = ""
+
+        if not response:
+            return {"importable": False, "error": "The import helper process exited unexpectedly"}
+
+        result: dict[str, Any] = json.loads(response)
+
+        return result
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def close(self) -> None:
+        if self.process.stdin is not None:
+            self.process.stdin.close()
+
+        try:
+            self.process.wait(timeout=5.0)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+class _ImportProbePool:
+    """A pool of `_ImportProbeHelper` processes, which are started on demand and shut
+    down when the interpreter exits."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+
+        self._idle: list[_ImportProbeHelper] = []
+        self._size = 0
+        self._condition = threading.Condition()
+
+        # Helpers inherited from the parent of a forked child
+        self._inherited: list[_ImportProbeHelper] = []
+
+        atexit.register(self.close)
+
+    def _forget_helpers(self) -> None:
+        """Drop the helpers inherited by a forked child, which its parent is still
+        using. They are kept referenced, rather than closed, so that the child never
+        flushes or closes the parent's pipes."""
+        self._inherited.extend(self._idle)
+        self._idle = []
+        self._size = 0
+        self._condition = threading.Condition()
+
+    def probe(self, package_name: str, timeout: float) -> dict[str, Any]:
+        with self._condition:
+            self._condition.wait_for(lambda: self._idle or self._size < self.max_size)
+
+            if self._idle:
+                helper = self._idle.pop()
+            else:
+                helper = None
+                self._size += 1
+
+        try:
+            if helper is None:
+                helper = _ImportProbeHelper()
+
+            return helper.probe(package_name, timeout)
+        finally:
+            with self._condition:
+                if helper is not None and helper.alive():
+                    self._idle.append(helper)
+                else:
+                    self._size -= 1
+
+                self._condition.notify()
+
+    def close(self) -> None:
+        with self._condition:
+            helpers, self._idle = self._idle, []
+            self._size -= len(helpers)
+
+        for helper in helpers:
+            helper.close()
+
+
+_PROBE_ONE_SCRIPT = """
+import importlib, json, sys, time
+sys.path[:] = json.loads(sys.argv[2])
+start = time.perf_counter()
+try:
+    importlib.import_module(sys.argv[1])
+    result = {"importable": True, "error": None}
+except BaseException as error:
+    result = {"importable": False, "error": f"{type(error).__name__}: {error}"}
+result["import_time"] = time.perf_counter() - start
+sys.__stdout__.write("\\n" + json.dumps(result) + "\\n")
+"""
+
+
+def _probe_in_new_process(package_name: str, timeout: float) -> dict[str, Any]:
+    """Perform an import in a new Python process, for platforms without `os.fork`."""
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE_ONE_SCRIPT, package_name, json.dumps(sys.path)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"importable": False, "error": f"Import timed out after {timeout} s"}
+    except OSError as error:
+        return {"importable": False, "error": str(error)}
+
+    lines = completed.stdout.strip().splitlines()
+
+    if completed.returncode != 0 or not lines:
+        return {"importable": False, "error": f"Import exited with status {completed.returncode}"}
+
+    result: dict[str, Any] = json.loads(lines[-1])
+
+    return result
+
+
+_IMPORT_PROBE_POOL = _ImportProbePool(max_size=min(4, os.cpu_count() or 1))
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_IMPORT_PROBE_POOL._forget_helpers)
+
+
+def probe_import(package_name: str, timeout: float = 60.0) -> ImportProbeResult:
+    """
+    Check whether a package can be imported, without importing it into this process.
+
+    The import is performed by a pool of helper processes, each of which forks a fresh
+    child for every import, so a package whose import hangs or crashes the interpreter
+    cannot affect the caller, and a successful import leaves no memory behind in it.
+    On platforms without `os.fork` a new Python process is started for each import.
+
+    Parameters
+    ----------
+    package_name
+        The name of the package to import.
+    timeout
+        The number of seconds after which the import is abandoned.
+
+    Returns
+    -------
+        Whether the import succeeded, how long it took and how much memory it used.
+    """
+    if hasattr(os, "fork"):
+        result = _IMPORT_PROBE_POOL.probe(package_name, timeout)
+    else:
+        result = _probe_in_new_process(package_name, timeout)
+
+    return ImportProbeResult(
+        package_name=package_name,
+        importable=result["importable"],
+        import_time=result.get("import_time"),
+        memory=result.get("memory"),
+        error=result.get("error"),
+    )
+
+
+def _is_oe_module_available(module_name: str) -> bool:
+    try:
+        return _is_openeye_module_licensed(module_name, license_ttl=0)
+    except ImportError:
+        return False
+
+
+def probe_environment(
+    packages: Iterable[str] = (),
+    executables: Iterable[str] = (),
+    oe_modules: Iterable[str] = (),
+    isolated_packages: Iterable[str] = (),
+    timeout: float = 60.0,
+    max_workers: int | None = None,
+) -> CapabilityReport:
+    """
+    Check for many optional dependencies at once.
+
+    The checks run concurrently on a thread pool: packages are looked for without being
+    imported (as by ``has_package(..., level="probe")``), executables are found with a
+    single pass over ``PATH``, and OpenEye modules are imported and their licenses
+    checked. Packages whose import is slow, or may crash the interpreter, can instead be
+    listed in ``isolated_packages`` to be imported in a separate process by `probe_import`.
+
+    The results are stored in the caches used by `has_package`, `has_executable`,
+    `find_executable` and `requires_oe_module`, so later checks for the same names
+    return immediately.
+
+    Parameters
+    ----------
+    packages
+        The names of the Python packages to look for.
+    executables
+        The names of the executables to look for.
+    oe_modules
+        The OpenEye modules (e.g. ``"oechem"``) to import and check the licenses of.
+    isolated_packages
+        The names of Python packages to try importing in a separate process.
+    timeout
+        The number of seconds after which an isolated import is considered to have failed.
+    max_workers
+        The maximum number of threads to use.
+
+    Returns
+    -------
+        The availability of each dependency.
+    """
+    packages = list(packages)
+    executables = list(executables)
+    oe_modules = list(oe_modules)
+    isolated_packages = list(isolated_packages)
+
+    for module_name in oe_modules:
+        if module_name not in _OPENEYE_LICENSE_FUNCTIONS:
+            raise ValueError(
+                f"Unknown OpenEye module {module_name!r}. Expected one of {sorted(_OPENEYE_LICENSE_FUNCTIONS)}."
+            )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        executables_future = executor.submit(find_executables, executables)
+        package_futures = {package_name: executor.submit(has_package, package_name) for package_name in packages}
+        oe_module_futures = {
+            module_name: executor.submit(_is_oe_module_available, module_name) for module_name in oe_modules
+        }
+        isolated_futures = {
+            package_name: executor.submit(probe_import, package_name, timeout) for package_name in isolated_packages
+        }
+
+        report = CapabilityReport(
+            packages={package_name: future.result() for package_name, future in package_futures.items()},
+            executables=executables_future.result(),
+            oe_modules={module_name: future.result() for module_name, future in oe_module_futures.items()},
+        )
+
+        for package_name, future in isolated_futures.items():
+            report.packages[package_name] = future.result().importable
+            _PACKAGE_CACHE[(package_name, "isolated")] = report.packages[package_name]
+
+    return report
@@ -1,15 +1,245 @@
+import copy
 import functools
+import hashlib
 import json
 import os
+import re
 import subprocess
+import threading
 import warnings
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
+from typing import Any
+
+from openff.utilities import instrumentation
+
+
+def _read_conda_meta_package_versions(prefix: str) -> dict[str, str] | None:
+    """
+    Returns the versions of the conda packages installed into an environment by
+    reading its `conda-meta` directory, or `None` if it has no such directory.
+
+    Each installed package is recorded as `conda-meta/{name}-{version}-{build}.json`,
+    and neither the version nor the build string may contain a dash, so the versions
+    can be read from the file names alone. The record itself is only parsed if its
+    name does not follow this pattern.
+    """
+    conda_meta = os.path.join(prefix, "conda-meta")
+
+    try:
+        entries = os.scandir(conda_meta)
+    except OSError:
+        return None
+
+    package_versions = {}
+
+    with entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+
+            name_version_build = entry.name[: -len(".json")].rsplit("-", 2)
+
+            if len(name_version_build) == 3 and all(name_version_build):
+                package_versions[name_version_build[0]] = name_version_build[1]
+                continue
+
+            try:
+                with open(entry.path) as file:
+                    record = json.load(file)
+
+                package_versions[record["name"]] = record["version"]
+            except (OSError, ValueError, KeyError):
+                continue
+
+    return package_versions
+
+
+def _get_active_conda_prefix() -> str | None:
+    """Returns the prefix of the active conda (or pixi) environment, if any."""
+    environment_active = os.environ.get("PIXI_IN_SHELL") == "1" or os.environ.get("CONDA_SHLVL", "0") != "0"
+
+    if environment_active and os.environ.get("CONDA_PREFIX"):
+        return os.path.abspath(os.environ["CONDA_PREFIX"])
+
+    return None
+
+
+def _get_conda_environment_fingerprint() -> str | None:
+    """
+    Returns a string which changes whenever packages are installed into, or removed
+    from, the active conda environment, or `None` if there is no such environment.
+
+    Installing or removing a package adds or removes a record in `conda-meta`, which
+    updates the modification time of the directory, so a single `stat` is enough.
+    """
+    prefix = _get_active_conda_prefix()
+
+    if prefix is None:
+        return None
+
+    try:
+        modified_time = os.stat(os.path.join(prefix, "conda-meta")).st_mtime_ns
+    except OSError:
+        return None
+
+    return f"{prefix}:{modified_time}"
+
+
+# The largest total size of the `conda list` results cached on disk
+_CONDA_LIST_CACHE_MAX_BYTES = 16 * 1024**2
+
+
+def _get_conda_list_fingerprint(conda_command: list[str]) -> str | None:
+    """
+    Returns a string which changes whenever the output of a `conda list` (or similar)
+    command may have changed, without running it, or `None` if there is no file which
+    reliably changes when packages are installed or removed.
+
+    The output depends on the command itself, on the executable (which may be updated),
+    and on the environment it lists. Installing or removing packages updates the lock
+    file of a pixi workspace and the ``conda-meta/history`` file of a conda
+    environment, but not the modification time of the environment's directory.
+    """
+    environment_paths = []
+
+    if os.environ.get("PIXI_IN_SHELL") == "1" and os.environ.get("PIXI_PROJECT_MANIFEST"):
+        environment_paths.append(os.path.join(os.path.dirname(os.environ["PIXI_PROJECT_MANIFEST"]), "pixi.lock"))
+
+    if os.environ.get("CONDA_PREFIX"):
+        environment_paths.append(os.path.join(os.environ["CONDA_PREFIX"], "conda-meta", "history"))
+
+    fingerprint = [" ".join(conda_command)]
+
+    for path in [conda_command[0], *environment_paths]:
+        try:
+            fingerprint.append(f"{path}:{os.stat(path).st_mtime_ns}")
+        except (OSError, ValueError):
+            fingerprint.append(f"{path}:-1")
+
+    if all(entry.endswith(":-1") for entry in fingerprint[2:]):
+        return None
+
+    return "\0".join(fingerprint)
+
+
+def _get_package_versions_cache_path(fingerprint: str) -> str | None:
+    """Returns the file in which the package versions listed for a fingerprint are cached
+    on disk, or `None` if there is no usable cache directory."""
+    from openff.utilities.caching import get_cache_dir
+
+    try:
+        cache_dir = get_cache_dir("conda-package-versions")
+    except OSError:
+        return None
+
+    return os.path.join(cache_dir, f"{hashlib.sha256(fingerprint.encode()).hexdigest()}.json")
+
+
+def _load_cached_package_versions(cache_path: str) -> dict[str, str] | None:
+    try:
+        with open(cache_path) as file:
+            cached = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cached, dict):
+        return None
+
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+
+    return cached
+
+
+def _store_package_versions(cache_path: str, package_versions: dict[str, str]) -> None:
+    """Caches package versions on disk, first evicting the least recently used results
+    so that the cache stays within `_CONDA_LIST_CACHE_MAX_BYTES`."""
+    from openff.utilities.caching import atomic_write, evict_least_recently_used
+
+    contents = json.dumps(package_versions).encode()
+
+    evict_least_recently_used(os.path.dirname(cache_path), max(_CONDA_LIST_CACHE_MAX_BYTES - len(contents), 0))
+    atomic_write(cache_path, contents)
+
+
+def _load_or_list_package_versions(
+    fingerprint: str | None,
+    list_package_versions: Callable[[], dict[str, str]],
+) -> dict[str, str]:
+    """
+    Returns the package versions cached on disk for a fingerprint, calling
+    `list_package_versions` and caching its result if there are none. If there is no
+    fingerprint the packages are always listed.
+
+    The cache is shared between processes, which hold a file lock while listing the
+    packages so that only one of them does so. Any failure to access the cache falls
+    back to listing the packages directly.
+    """
+    from openff.utilities.caching import file_lock
+
+    cache_path = None if fingerprint is None else _get_package_versions_cache_path(fingerprint)
+
+    if cache_path is None:
+        return list_package_versions()
+
+    package_versions = _load_cached_package_versions(cache_path)
+
+    if package_versions is not None:
+        return package_versions
+
+    try:
+        with file_lock(f"{os.path.dirname(cache_path)}.lock"):
+            # Another process may have listed the packages while this one was waiting
+            package_versions = _load_cached_package_versions(cache_path)
+
+            if package_versions is None:
+                package_versions = list_package_versions()
+                _store_package_versions(cache_path, package_versions)
+    except OSError:
+        if package_versions is None:
+            package_versions = list_package_versions()
+
+    return package_versions
 
 
 @functools.lru_cache
 def _get_conda_list_package_versions() -> dict[str, str]:
     """
-    Returns the versions of any packages found while executing `conda list`.
-    If no conda executable is found, emits CondaExecutableNotFoundWarning
+    Returns the versions of any packages found in the active conda (or pixi) environment.
+
+    The `conda-meta` directory of the environment is read directly if possible, falling
+    back to executing `conda list` or similar, whose results are cached on disk (keyed
+    by `_get_conda_list_fingerprint`, if possible) so that they are shared between
+    processes and refreshed whenever the environment changes. If no environment is active and no
+    conda executable is found, emits CondaExecutableNotFoundWarning
+    """
+    prefix = _get_active_conda_prefix()
+
+    if prefix is not None:
+        with instrumentation.timer("provenance.read_conda_meta"):
+            package_versions = _read_conda_meta_package_versions(prefix)
+
+        if package_versions is not None:
+            return package_versions
+
+    conda_command = _get_conda_list_command()
+
+    if conda_command is None:
+        return dict()
+
+    return _load_or_list_package_versions(
+        _get_conda_list_fingerprint(conda_command),
+        functools.partial(_run_conda_list, conda_command),
+    )
+
+
+def _get_conda_list_command() -> list[str] | None:
+    """
+    Returns the command which lists the packages in the active environment, or `None`
+    (after emitting CondaExecutableNotFoundWarning) if no conda executable is found.
     """
     from openff.utilities.warnings import CondaExecutableNotFoundWarning
 
@@ -26,9 +256,14 @@ def _get_conda_list_package_versions() -> dict[str, str]:
             "No conda/mamba/micromamba executable found. Unable to determine package versions.",
             CondaExecutableNotFoundWarning,
         )
-        return dict()
+        return None
 
-    output = json.loads(subprocess.check_output(conda_command.split()).decode())
+    return conda_command.split()
+
+
+def _parse_conda_list_output(conda_list_output: bytes) -> dict[str, str]:
+    """Returns the package versions reported by `conda list --json` or similar."""
+    output = json.loads(conda_list_output.decode())
 
     # micromamba >= 2.9.0 nests the package list under a "packages" key instead
     # of returning it as the top-level array (mamba-org/mamba#4202, issue #156).
@@ -43,6 +278,144 @@ def _get_conda_list_package_versions() -> dict[str, str]:
     return package_versions
 
 
+def _run_conda_list(conda_command: list[str]) -> dict[str, str]:
+    with instrumentation.timer("provenance.conda_list"):
+        conda_list_output = subprocess.check_output(conda_command)
+
+    return _parse_conda_list_output(conda_list_output)
+
+
+async def _list_conda_package_versions_async() -> dict[str, str]:
+    """
+    An asynchronous version of `_get_conda_list_package_versions` which runs `conda list`
+    or similar with `asyncio.create_subprocess_exec`, sharing its cache on disk.
+    """
+    import asyncio
+
+    prefix = _get_active_conda_prefix()
+
+    if prefix is not None:
+        with instrumentation.timer("provenance.read_conda_meta"):
+            package_versions = await asyncio.to_thread(_read_conda_meta_package_versions, prefix)
+
+        if package_versions is not None:
+            return package_versions
+
+    conda_command = _get_conda_list_command()
+
+    if conda_command is None:
+        return dict()
+
+    fingerprint = _get_conda_list_fingerprint(conda_command)
+    cache_path = None if fingerprint is None else _get_package_versions_cache_path(fingerprint)
+
+    if cache_path is not None:
+        package_versions = _load_cached_package_versions(cache_path)
+
+        if package_versions is not None:
+            return package_versions
+
+    with instrumentation.timer("provenance.conda_list"):
+        process = await asyncio.create_subprocess_exec(*conda_command, stdout=asyncio.subprocess.PIPE)
+        stdout, _ = await process.communicate()
+
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, conda_command, output=stdout)
+
+    package_versions = _parse_conda_list_output(stdout)
+
+    if cache_path is not None:
+        try:
+            _store_package_versions(cache_path, package_versions)
+        except OSError:
+            pass
+
+    return package_versions
+
+
+# The result of the package listing started by `prefetch_provenance` (or completed by
+# `get_ambertools_version_async`), which is used in preference to listing packages again
+_PACKAGE_VERSIONS_FUTURE: "Future[dict[str, str]] | None" = None
+_PACKAGE_VERSIONS_FUTURE_LOCK = threading.Lock()
+
+
+def prefetch_provenance() -> "Future[dict[str, str]]":
+    """
+    Start collecting the versions of the packages in the active environment on a
+    background thread, e.g. when a service starts, so that later calls to
+    `get_ambertools_version` return immediately or only wait for the remaining time.
+
+    Calling this function more than once returns the same future.
+
+    Returns
+    -------
+        A future which resolves to the versions of the installed packages, keyed by name.
+    """
+    global _PACKAGE_VERSIONS_FUTURE
+
+    with _PACKAGE_VERSIONS_FUTURE_LOCK:
+        if _PACKAGE_VERSIONS_FUTURE is None:
+            future: Future[dict[str, str]] = Future()
+
+            def _collect() -> None:
+                if not future.set_running_or_notify_cancel():
+                    return
+
+                try:
+                    future.set_result(_get_conda_list_package_versions())
+                except BaseException as error:
+                    future.set_exception(error)
+
+            threading.Thread(target=_collect, name="openff-provenance-prefetch", daemon=True).start()
+
+            _PACKAGE_VERSIONS_FUTURE = future
+
+        return _PACKAGE_VERSIONS_FUTURE
+
+
+def _get_package_versions() -> dict[str, str]:
+    _get_current_environment_fingerprint()
+
+    if _PACKAGE_VERSIONS_FUTURE is not None:
+        return _PACKAGE_VERSIONS_FUTURE.result()
+
+    return _get_conda_list_package_versions()
+
+
+async def _get_package_versions_async() -> dict[str, str]:
+    import asyncio
+
+    global _PACKAGE_VERSIONS_FUTURE
+
+    _get_current_environment_fingerprint()
+
+    if _PACKAGE_VERSIONS_FUTURE is not None:
+        return await asyncio.wrap_future(_PACKAGE_VERSIONS_FUTURE)
+
+    if _get_conda_environment_fingerprint() is not None or _get_conda_list_package_versions.cache_info().currsize:
+        # Packages are listed without a subprocess (or have already been listed)
+        return await asyncio.to_thread(_get_conda_list_package_versions)
+
+    package_versions = await _list_conda_package_versions_async()
+
+    with _PACKAGE_VERSIONS_FUTURE_LOCK:
+        if _PACKAGE_VERSIONS_FUTURE is None:
+            _PACKAGE_VERSIONS_FUTURE = Future()
+            _PACKAGE_VERSIONS_FUTURE.set_result(package_versions)
+
+    return package_versions
+
+
+def _warn_conda_list_failed() -> None:
+    from openff.utilities.warnings import CondaExecutableNotFoundWarning
+
+    warnings.warn(
+        "Something went wrong parsing the output of `conda list` or similar. Unable to "
+        "determine AmberTools version, returning None.",
+        CondaExecutableNotFoundWarning,
+    )
+
+
 def get_ambertools_version() -> str | None:
     """
     Attempts to retrieve the version of the currently installed AmberTools.
@@ -52,20 +425,385 @@ def get_ambertools_version() -> str | None:
             warned by `_get_conda_list_package_versions` and this function returns `None`.
         2. If there is a failure calling `{conda|mamba|etc.} list`, this function
             still returns `None`, but without a warning associated with the above failure.
+
+    If `prefetch_provenance` has been called, its result is used.
     """
 
     try:
-        return _get_conda_list_package_versions().get("ambertools", None)
+        return _get_package_versions().get("ambertools", None)
     except (
         ValueError,  # Issue 98
         subprocess.CalledProcessError,  # Issue 101
     ):
-        from openff.utilities.warnings import CondaExecutableNotFoundWarning
+        _warn_conda_list_failed()
 
-        warnings.warn(
-            "Something went wrong parsing the output of `conda list` or similar. Unable to "
-            "determine AmberTools version, returning None.",
-            CondaExecutableNotFoundWarning,
+        return None
+
+
+async def get_ambertools_version_async() -> str | None:
+    """
+    An asynchronous version of `get_ambertools_version` for use within an event loop.
+
+    Any `conda list` or similar subprocess is run with `asyncio.create_subprocess_exec`,
+    so the event loop is not blocked while packages are listed.
+    """
+
+    try:
+        return (await _get_package_versions_async()).get("ambertools", None)
+    except (
+        ValueError,  # Issue 98
+        subprocess.CalledProcessError,  # Issue 101
+    ):
+        _warn_conda_list_failed()
+
+        return None
+
+
+# The arguments which make an executable print its version, if not ``--version``
+_VERSION_ARGUMENTS: dict[str, list[str]] = {
+    "obabel": ["-V"],
+}
+
+# Executables which do not report their own version, but are distributed by AmberTools
+_AMBERTOOLS_EXECUTABLES = frozenset(
+    ["antechamber", "parmchk2", "pmemd", "reduce", "sander", "sqm", "teLeap", "tleap"],
+)
+
+# (resolved path, modification time) -> version
+_EXECUTABLE_VERSIONS: dict[tuple[str, int], str | None] = {}
+_EXECUTABLE_VERSIONS_LOCK = threading.Lock()
+
+
+def _run_version_command(executable_path: str, timeout: float) -> str | None:
+    """
+    Returns the first line printed by an executable when asked for its version, raising
+    `subprocess.TimeoutExpired` if it does not finish within ``timeout`` seconds.
+    """
+    arguments = _VERSION_ARGUMENTS.get(os.path.basename(executable_path), ["--version"])
+
+    try:
+        result = subprocess.run(
+            [executable_path, *arguments],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            timeout=timeout,
         )
+    except subprocess.TimeoutExpired:
+        raise
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    output = result.stdout.decode(errors="replace").strip()
+
+    return output.splitlines()[0] if output and result.returncode == 0 else None
+
+
+def _get_ambertools_executable_version(executable_path: str) -> str | None:
+    """
+    Returns the version of AmberTools if ``executable_path`` is an AmberTools executable
+    installed into the active conda environment, and `None` otherwise.
+    """
+    if os.path.basename(executable_path) not in _AMBERTOOLS_EXECUTABLES:
+        return None
 
+    prefix = _get_active_conda_prefix()
+
+    if prefix is None or not executable_path.startswith(os.path.join(prefix, "")):
         return None
+
+    return get_ambertools_version()
+
+
+def get_executable_versions(executables: Iterable[str], timeout: float = 10.0) -> dict[str, str | None]:
+    """
+    Returns the versions of several executables, asking each for its version in parallel.
+
+    Each executable is run with ``--version`` (or its equivalent) and the first line of
+    its output is recorded. AmberTools programs, which cannot report their own version,
+    are instead reported with the version of the AmberTools conda package they were
+    installed with. Versions are cached by the resolved path and modification time of
+    each executable, so repeated calls do not start any processes unless an executable
+    has been replaced.
+
+    Parameters
+    ----------
+    executables
+        The names of, or paths to, the executables.
+    timeout
+        The maximum number of seconds to wait for each executable.
+
+    Returns
+    -------
+        The version of each executable, or `None` if it could not be found, failed, did
+        not finish within the timeout or does not report a version.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from openff.utilities.utilities import find_executables
+
+    executables = list(executables)
+    versions: dict[str, str | None] = {}
+    to_run: dict[tuple[str, int], list[str]] = {}
+
+    for executable, executable_path in find_executables(executables).items():
+        versions[executable] = None
+
+        if executable_path is None:
+            continue
+
+        executable_path = os.path.realpath(executable_path)
+
+        try:
+            cache_key = (executable_path, os.stat(executable_path).st_mtime_ns)
+        except OSError:
+            continue
+
+        with _EXECUTABLE_VERSIONS_LOCK:
+            if cache_key in _EXECUTABLE_VERSIONS:
+                versions[executable] = _EXECUTABLE_VERSIONS[cache_key]
+                continue
+
+        ambertools_version = _get_ambertools_executable_version(executable_path)
+
+        if ambertools_version is not None:
+            versions[executable] = ambertools_version
+
+            with _EXECUTABLE_VERSIONS_LOCK:
+                _EXECUTABLE_VERSIONS[cache_key] = ambertools_version
+
+            continue
+
+        to_run.setdefault(cache_key, []).append(executable)
+
+    if to_run:
+        with ThreadPoolExecutor(max_workers=min(len(to_run), 8)) as executor:
+            futures = {cache_key: executor.submit(_run_version_command, cache_key[0], timeout) for cache_key in to_run}
+
+        for cache_key, future in futures.items():
+            try:
+                version = future.result()
+            except subprocess.TimeoutExpired:
+                # Timeouts may be transient, so are not cached
+                continue
+
+            with _EXECUTABLE_VERSIONS_LOCK:
+                _EXECUTABLE_VERSIONS[cache_key] = version
+
+            for executable in to_run[cache_key]:
+                versions[executable] = version
+
+    return {executable: versions[executable] for executable in executables}
+
+
+def _normalize_package_name(package_name: str) -> str:
+    return re.sub(r"[-_.]+", "-", package_name).lower()
+
+
+def _get_dependency_versions(packages: Iterable[str], executables: Iterable[str]) -> dict[str, Any]:
+    """
+    Returns the versions of some Python or conda packages and executables, e.g. to key
+    cached results on.
+
+    Packages are looked up as installed Python distributions first, and then in the
+    active conda environment. Packages and executables which cannot be found have a
+    version of `None`.
+    """
+    import importlib.metadata
+
+    from openff.utilities.warnings import CondaExecutableNotFoundWarning
+
+    package_versions: dict[str, str | None] = {}
+    conda_packages: dict[str, str] | None = None
+
+    for package_name in packages:
+        try:
+            package_versions[package_name] = importlib.metadata.version(package_name)
+            continue
+        except importlib.metadata.PackageNotFoundError:
+            pass
+
+        if conda_packages is None:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", CondaExecutableNotFoundWarning)
+
+                try:
+                    conda_packages = {
+                        _normalize_package_name(name): version for name, version in _get_package_versions().items()
+                    }
+                except (ValueError, subprocess.CalledProcessError):
+                    conda_packages = {}
+
+        package_versions[package_name] = conda_packages.get(_normalize_package_name(package_name))
+
+    return {"packages": package_versions, "executables": get_executable_versions(executables)}
+
+
+# The `environment_fingerprint` when packages were last listed, which are listed again
+# when the fingerprint changes
+_PACKAGE_VERSIONS_FINGERPRINT: str | None = None
+
+
+def _get_current_environment_fingerprint() -> str:
+    """
+    Returns the current `environment_fingerprint`, first discarding any package versions
+    listed, or provenance recorded, before the environment last changed.
+    """
+    from openff.utilities.caching import environment_fingerprint
+
+    global _PACKAGE_VERSIONS_FINGERPRINT, _PACKAGE_VERSIONS_FUTURE
+
+    fingerprint = environment_fingerprint()
+
+    with _PACKAGE_VERSIONS_FUTURE_LOCK:
+        if fingerprint != _PACKAGE_VERSIONS_FINGERPRINT:
+            if _PACKAGE_VERSIONS_FINGERPRINT is not None:
+                _get_conda_list_package_versions.cache_clear()
+                _get_environment_provenance.cache_clear()
+                _PACKAGE_VERSIONS_FUTURE = None
+
+            _PACKAGE_VERSIONS_FINGERPRINT = fingerprint
+
+    return fingerprint
+
+
+@functools.lru_cache
+def _get_environment_provenance(executables: tuple[str, ...], fingerprint: str) -> tuple[dict[str, Any], str]:
+    """Returns the (cached) provenance of the environment and its compact JSON form,
+    keyed by the `environment_fingerprint` it was recorded in."""
+    import importlib.metadata
+    import platform
+    import sys
+
+    from openff.utilities.warnings import CondaExecutableNotFoundWarning
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", CondaExecutableNotFoundWarning)
+
+        try:
+            conda_packages = _get_package_versions()
+        except (ValueError, subprocess.CalledProcessError):
+            conda_packages = {}
+
+    python_packages = {}
+
+    for distribution in importlib.metadata.distributions():
+        name = distribution.metadata["Name"]
+
+        if name and name not in python_packages:
+            python_packages[name] = distribution.version
+
+    provenance = {
+        "python": {
+            "implementation": platform.python_implementation(),
+            "version": platform.python_version(),
+            "executable": sys.executable,
+        },
+        "platform": {
+            "system": platform.system(),
+            "release": platform.release(),
+            "machine": platform.machine(),
+        },
+        "conda_packages": dict(sorted(conda_packages.items())),
+        "python_packages": dict(sorted(python_packages.items())),
+        "executables": get_executable_versions(executables),
+    }
+
+    return provenance, provenance_to_json(provenance)
+
+
+def get_environment_provenance(executables: Iterable[str] = ()) -> dict[str, Any]:
+    """
+    Returns a record of the environment in which results are being computed.
+
+    The record contains the Python interpreter and platform, the versions of any conda
+    packages in the active environment, the versions of every installed Python
+    distribution (from `importlib.metadata`) and, optionally, the versions of a set of
+    executables (see `get_executable_versions`). The environment is only inspected once per
+    set of executables, and again whenever packages are installed or removed (as detected by
+    `openff.utilities.caching.environment_fingerprint`), so repeated calls are cheap.
+
+    Parameters
+    ----------
+    executables
+        The names of any executables whose versions should be recorded.
+
+    Returns
+    -------
+        The provenance, with the sections ``"python"``, ``"platform"``,
+        ``"conda_packages"``, ``"python_packages"`` and ``"executables"``.
+
+    See Also
+    --------
+    provenance_to_json, provenance_hash, diff_provenance
+    """
+    provenance, _ = _get_environment_provenance(
+        tuple(sorted(set(executables))),
+        _get_current_environment_fingerprint(),
+    )
+
+    return copy.deepcopy(provenance)
+
+
+def provenance_to_json(provenance: dict[str, Any]) -> str:
+    """
+    Serializes a provenance record, e.g. from `get_environment_provenance`, to compact
+    JSON with sorted keys, such that equal records always produce identical strings.
+    """
+    return json.dumps(provenance, sort_keys=True, separators=(",", ":"))
+
+
+def provenance_hash(provenance: dict[str, Any] | None = None) -> str:
+    """
+    Returns a short, stable hash of a provenance record, which can be stored alongside
+    results in place of the full record.
+
+    Parameters
+    ----------
+    provenance
+        The record to hash. Defaults to ``get_environment_provenance()``, in which case
+        the cached serialization of the record is reused.
+    """
+    if provenance is None:
+        _, serialized = _get_environment_provenance((), _get_current_environment_fingerprint())
+    else:
+        serialized = provenance_to_json(provenance)
+
+    return hashlib.sha256(serialized.encode()).hexdigest()[:16]
+
+
+def _flatten_provenance(provenance: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    flattened = {}
+
+    for key, value in provenance.items():
+        if isinstance(value, dict):
+            flattened.update(_flatten_provenance(value, f"{prefix}{key}."))
+        else:
+            flattened[f"{prefix}{key}"] = value
+
+    return flattened
+
+
+def diff_provenance(old: dict[str, Any], new: dict[str, Any]) -> dict[str, tuple[Any, Any]]:
+    """
+    Compares two provenance records.
+
+    Returns
+    -------
+        The entries which differ between the records, keyed by their dotted path (e.g.
+        ``"conda_packages.ambertools"``) and mapped to their ``(old, new)`` values. Entries
+        missing from one of the records are reported as `None`.
+
+    Examples
+    --------
+    >>> diff_provenance({"conda_packages": {"ambertools": "22.0"}}, {"conda_packages": {"ambertools": "23.6"}})
+    {'conda_packages.ambertools': ('22.0', '23.6')}
+    """
+    old_flattened = _flatten_provenance(old)
+    new_flattened = _flatten_provenance(new)
+
+    return {
+        key: (old_flattened.get(key), new_flattened.get(key))
+        for key in sorted(old_flattened.keys() | new_flattened.keys())
+        if old_flattened.get(key) != new_flattened.get(key)
+    }
@@ -0,0 +1,92 @@
+"""
+A pytest plugin, registered through the ``pytest11`` entry point, which reuses the
+results of `skip_if_missing` and `skip_if_missing_exec` across test sessions.
+
+The capabilities found by a session are stored in the pytest cache alongside the
+`openff.utilities.caching.environment_fingerprint`, and are reused by later sessions
+until the fingerprint changes. When running with pytest-xdist, the controller (which
+does not collect tests itself) sends the stored capabilities to each worker and merges
+back whatever the workers found. Within a session that starts with an empty or stale
+cache, each worker therefore still looks up the capabilities its tests need.
+"""
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+if TYPE_CHECKING:
+    from _pytest.config import Config
+
+_CACHE_KEY = "openff-utilities/capabilities"
+_WORKER_KEY = "openff_utilities_capabilities"
+_FINGERPRINT = pytest.StashKey[str]()
+
+
+def _get_fingerprint(config: "Config") -> str:
+    # The fingerprint is taken when the session starts and reused when it finishes, as
+    # collecting tests adds their directories to `sys.path`
+    if _FINGERPRINT not in config.stash:
+        from openff.utilities.caching import environment_fingerprint
+
+        config.stash[_FINGERPRINT] = environment_fingerprint()
+
+    return config.stash[_FINGERPRINT]
+
+
+def _load_capabilities(config: "Config") -> dict[str, bool]:
+    # `config.cache` is only set when the cacheprovider plugin is enabled
+    cache = getattr(config, "cache", None)
+
+    if cache is None:
+        return {}
+
+    fingerprint = _get_fingerprint(config)
+    cached = cache.get(_CACHE_KEY, None)
+
+    if not isinstance(cached, dict) or cached.get("fingerprint") != fingerprint:
+        return {}
+
+    capabilities: dict[str, bool] = cached.get("capabilities", {})
+
+    return capabilities
+
+
+def pytest_configure(config: "Config") -> None:
+    from openff.utilities import testing
+
+    workerinput: dict[str, Any] | None = getattr(config, "workerinput", None)
+
+    if workerinput is not None:
+        testing._CAPABILITIES.update(workerinput.get(_WORKER_KEY, {}))
+    else:
+        testing._CAPABILITIES.update(_load_capabilities(config))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node: Any) -> None:
+    from openff.utilities import testing
+
+    node.workerinput[_WORKER_KEY] = dict(testing._CAPABILITIES)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: Any, error: Any) -> None:
+    from openff.utilities import testing
+
+    testing._CAPABILITIES.update(getattr(node, "workeroutput", {}).get(_WORKER_KEY, {}))
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    from openff.utilities import testing
+
+    config = session.config
+    workeroutput: dict[str, Any] | None = getattr(config, "workeroutput", None)
+    cache = getattr(config, "cache", None)
+
+    if workeroutput is not None:
+        workeroutput[_WORKER_KEY] = dict(testing._CAPABILITIES)
+    elif cache is not None and testing._CAPABILITIES != _load_capabilities(config):
+        cache.set(
+            _CACHE_KEY,
+            {"fingerprint": _get_fingerprint(config), "capabilities": dict(testing._CAPABILITIES)},
+        )
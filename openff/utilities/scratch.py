@@ -0,0 +1,363 @@
+import atexit
+import os
+import queue
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import uuid
+import weakref
+from collections.abc import Generator
+from contextlib import contextmanager
+
+_SCRATCH_PREFIX = "openff-scratch-"
+
+
+def _scratch_owner() -> str:
+    """The part of a scratch directory name which identifies the process owning it."""
+    return f"{socket.gethostname()}-{os.getpid()}-"
+
+
+def _is_process_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill(pid, 0) terminates the process on Windows, so assume it is alive
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
+def _wipe_directory(directory_path: str) -> None:
+    """Delete the contents of a directory, but not the directory itself."""
+    with os.scandir(directory_path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+
+
+def _remove_directories(directory_paths: list[tuple[str, float]]) -> None:
+    for directory_path, _ in directory_paths:
+        shutil.rmtree(directory_path, ignore_errors=True)
+
+    directory_paths.clear()
+
+
+class ScratchDirectoryPool:
+    """A pool of scratch directories which are wiped and reused rather than being
+    created and destroyed each time one is needed.
+
+    Directories are named after the host and process which created them, so that
+    directories abandoned by crashed processes can be found and removed by
+    `reap_abandoned`, which is called when the pool is created.
+
+    Parameters
+    ----------
+    root: str, optional
+        The directory in which scratch directories are created, e.g. ``/dev/shm``.
+        Defaults to the system temporary directory.
+    max_size: int
+        The maximum number of idle directories kept for reuse. Directories released
+        while the pool is full are deleted.
+    max_age: float
+        The number of seconds an idle directory is kept before it is deleted.
+
+    Examples
+    --------
+    >>> pool = ScratchDirectoryPool(root="/dev/shm", max_size=4)
+    >>> with temporary_cd(pool=pool):
+    ...     run_antechamber()
+    """
+
+    def __init__(self, root: str | None = None, max_size: int = 8, max_age: float = 600.0):
+        self.root = os.path.abspath(tempfile.gettempdir() if root is None else root)
+        self.max_size = max_size
+        self.max_age = max_age
+
+        os.makedirs(self.root, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # (path, time.monotonic() at which the directory was released)
+        self._idle: list[tuple[str, float]] = []
+
+        weakref.finalize(self, _remove_directories, self._idle)
+        _POOLS.add(self)
+
+        self.reap_abandoned()
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+
+        expired = [entry for entry in self._idle if now - entry[1] >= self.max_age]
+        self._idle[:] = [entry for entry in self._idle if now - entry[1] < self.max_age]
+
+        _remove_directories(expired)
+
+    def acquire(self) -> str:
+        """Return the path to an empty scratch directory, reusing an idle one if possible."""
+        with self._lock:
+            self._expire()
+
+            if self._idle:
+                return self._idle.pop()[0]
+
+        return tempfile.mkdtemp(prefix=f"{_SCRATCH_PREFIX}{_scratch_owner()}", dir=self.root)
+
+    def release(self, directory_path: str) -> None:
+        """Wipe a directory returned by `acquire` and return it to the pool."""
+        try:
+            _wipe_directory(directory_path)
+        except OSError:
+            shutil.rmtree(directory_path, ignore_errors=True)
+            return
+
+        with self._lock:
+            self._expire()
+
+            if len(self._idle) < self.max_size:
+                self._idle.append((directory_path, time.monotonic()))
+                return
+
+        shutil.rmtree(directory_path, ignore_errors=True)
+
+    @contextmanager
+    def directory(self) -> Generator[str, None, None]:
+        """Borrow a scratch directory for the duration of a ``with`` block."""
+        directory_path = self.acquire()
+
+        try:
+            yield directory_path
+        finally:
+            self.release(directory_path)
+
+    def clear(self) -> None:
+        """Delete every idle directory in the pool."""
+        with self._lock:
+            _remove_directories(self._idle)
+
+    def reap_abandoned(self) -> int:
+        """
+        Delete scratch directories under ``root`` which were created on this host by
+        processes which are no longer running.
+
+        Returns
+        -------
+            The number of directories which were deleted.
+        """
+        hostname = socket.gethostname()
+        reaped = 0
+
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if not entry.name.startswith(f"{_SCRATCH_PREFIX}{hostname}-") or not entry.is_dir():
+                    continue
+
+                pid = entry.name[len(f"{_SCRATCH_PREFIX}{hostname}-") :].split("-", 1)[0]
+
+                if not pid.isdigit() or _is_process_alive(int(pid)):
+                    continue
+
+                shutil.rmtree(entry.path, ignore_errors=True)
+                reaped += 1
+
+        return reaped
+
+
+# Every pool in this process, whose idle directories are forgotten by forked children
+_POOLS: "weakref.WeakSet[ScratchDirectoryPool]" = weakref.WeakSet()
+
+
+def _forget_idle_directories() -> None:
+    """Empty the pools of a forked child, as its idle directories belong to the parent,
+    which may hand them out at the same time."""
+    for pool in list(_POOLS):
+        pool._lock = threading.Lock()
+        pool._idle.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_idle_directories)
+
+
+def _directory_size(directory_path: str) -> int:
+    """The total size, in bytes, of the files within a directory tree."""
+    total = 0
+
+    try:
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    total += _directory_size(entry.path)
+                else:
+                    total += entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        pass
+
+    return total
+
+
+class _DeferredRemover:
+    """Deletes directories on a background thread, fed by a bounded queue."""
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self._reset()
+
+    def _reset(self) -> None:
+        self._queue: queue.Queue[str] = queue.Queue(maxsize=self.max_pending)
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+        self.pending_directories = 0
+        self.pending_bytes = 0
+        self.removed_directories = 0
+        self.removed_bytes = 0
+
+    def _ensure_started(self) -> None:
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(target=self._run, name="openff-deferred-removal", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            directory_path = self._queue.get()
+
+            # The directory is measured here, rather than by `submit`, so that deferring
+            # the removal of a large tree is no slower than deferring a small one
+            size = _directory_size(directory_path)
+
+            with self._condition:
+                self.pending_bytes += size
+
+            shutil.rmtree(directory_path, ignore_errors=True)
+
+            with self._condition:
+                self.pending_directories -= 1
+                self.pending_bytes -= size
+                self.removed_directories += 1
+                self.removed_bytes += size
+                self._condition.notify_all()
+
+    def submit(self, directory_path: str) -> None:
+        parent, name = os.path.split(os.path.abspath(directory_path))
+        trash_path = os.path.join(parent, f".{name}.openff-trash-{uuid.uuid4().hex}")
+
+        try:
+            os.rename(directory_path, trash_path)
+        except OSError:
+            shutil.rmtree(directory_path, ignore_errors=True)
+            return
+
+        with self._condition:
+            try:
+                self._queue.put_nowait(trash_path)
+            except queue.Full:
+                queued = False
+            else:
+                queued = True
+                self.pending_directories += 1
+
+        if queued:
+            self._ensure_started()
+        else:
+            # The queue is full, so apply back-pressure by deleting the directory here
+            shutil.rmtree(trash_path, ignore_errors=True)
+
+    def flush(self, timeout: float | None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: self.pending_directories == 0, timeout)
+
+    def stats(self) -> dict[str, int]:
+        with self._condition:
+            return {
+                "pending_directories": self.pending_directories,
+                "pending_bytes": self.pending_bytes,
+                "removed_directories": self.removed_directories,
+                "removed_bytes": self.removed_bytes,
+            }
+
+
+# The maximum number of directories waiting to be deleted before `defer_removal`
+# falls back to deleting directories synchronously
+_DEFERRED_REMOVAL_MAX_PENDING = 64
+
+_DEFERRED_REMOVER = _DeferredRemover(max_pending=_DEFERRED_REMOVAL_MAX_PENDING)
+
+if hasattr(os, "register_at_fork"):
+    # A forked child does not inherit the thread deleting its parent's directories, so
+    # starts afresh rather than waiting for (or deleting) the directories itself
+    os.register_at_fork(after_in_child=_DEFERRED_REMOVER._reset)
+
+
+def defer_removal(directory_path: str) -> None:
+    """
+    Delete a directory tree on a background thread.
+
+    The directory is first renamed aside, so that its original path can be reused
+    immediately, and then queued for deletion. If too many directories are already
+    waiting to be deleted the directory is deleted immediately instead. Pending
+    directories are deleted before the interpreter exits.
+
+    Parameters
+    ----------
+    directory_path: str
+        The directory to delete.
+    """
+    _DEFERRED_REMOVER.submit(directory_path)
+
+
+def flush_deferred_removals(timeout: float | None = None) -> bool:
+    """
+    Wait for every directory passed to `defer_removal` to be deleted.
+
+    Parameters
+    ----------
+    timeout: float, optional
+        The maximum number of seconds to wait.
+
+    Returns
+    -------
+        Whether all pending directories were deleted before the timeout.
+    """
+    return _DEFERRED_REMOVER.flush(timeout)
+
+
+def deferred_removal_stats() -> dict[str, int]:
+    """
+    Report on the directories passed to `defer_removal`.
+
+    Returns
+    -------
+        The number of directories which are still waiting to be deleted
+        (``pending_directories``) and the bytes within those the background thread is
+        deleting (``pending_bytes``), and the number of directories, and the bytes they
+        contained, which have been deleted (``removed_directories`` and
+        ``removed_bytes``).
+    """
+    return _DEFERRED_REMOVER.stats()
+
+
+atexit.register(flush_deferred_removals)
+
+
+@contextmanager
+def deferred_temporary_directory() -> Generator[str, None, None]:
+    """Create a temporary directory which is deleted in the background by
+    `defer_removal` when the context manager is closed."""
+    directory_path = tempfile.mkdtemp()
+
+    try:
+        yield directory_path
+    finally:
+        defer_removal(directory_path)
@@ -5,6 +5,27 @@ from openff.utilities.utilities import has_executable, has_package
 if TYPE_CHECKING:
     from _pytest.mark.structures import MarkDecorator
 
+# Whether each package (keyed as "package:<name>") or executable (keyed as
+# "executable:<name>") needed by a skip mark is available. This is seeded and persisted
+# by `openff.utilities.pytest_plugin`, so that the lookups are reused by later test
+# sessions (and their pytest-xdist workers)
+_CAPABILITIES: dict[str, bool] = {}
+
+
+def _has_capability(kind: str, name: str) -> bool:
+    key = f"{kind}:{name}"
+
+    try:
+        return _CAPABILITIES[key]
+    except KeyError:
+        pass
+
+    # Packages are only looked for, not imported, so that collecting tests stays cheap
+    available = has_package(name, level="probe") if kind == "package" else has_executable(name)
+    _CAPABILITIES[key] = available
+
+    return available
+
 
 def skip_if_missing(package_name: str, reason: str | None = None) -> "MarkDecorator":
     """
@@ -28,7 +49,7 @@ def skip_if_missing(package_name: str, reason: str | None = None) -> "MarkDecora
 
     if not reason:
         reason = f"Package {package_name} is required, but was not found."
-    requires_package = pytest.mark.skipif(not has_package(package_name), reason=reason)
+    requires_package = pytest.mark.skipif(not _has_capability("package", package_name), reason=reason)
     return requires_package
 
 
@@ -45,9 +66,7 @@ def skip_if_missing_exec(exec: str | list[str]) -> "MarkDecorator":
     else:
         raise ValueError(f"Bad type passed to skip_if_missing_exec. Found type {type(exec)}")
 
-    found_exec = False
-    for exec_ in execs:
-        found_exec = found_exec or has_executable(exec_)
+    found_exec = any(_has_capability("executable", exec_) for exec_ in execs)
 
     reason = f"Package {exec!s} is required, but was not found."
     mark = pytest.mark.skipif(not found_exec, reason=reason)
@@ -1,29 +1,65 @@
 import errno
 import importlib
+import importlib.util
+import math
 import os
-from collections.abc import Callable, Generator
-from contextlib import contextmanager
+import posixpath
+import sys
+import threading
+import time
+import types
+from collections.abc import Callable, Generator, Iterable, Sequence
+from contextlib import AbstractContextManager, contextmanager
+from contextvars import ContextVar
 from functools import wraps
-from importlib.resources import as_file, files
-from tempfile import TemporaryDirectory
-from typing import Any, Literal, TypeVar
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
 
+from openff.utilities import caching, instrumentation
 from openff.utilities.exceptions import MissingOptionalDependencyError
 
+if TYPE_CHECKING:
+    import subprocess
+    from importlib.resources.abc import Traversable
+
+    from openff.utilities.scratch import ScratchDirectoryPool
+
 # https://mypy.readthedocs.io/en/stable/generics.html#declaring-decorators
 
 F = TypeVar("F", bound=Callable[..., Any])
 
 
-def has_package(package_name: str) -> bool:
+_PACKAGE_CACHE: dict[tuple[str, str], bool] = {}
+
+# The `environment_fingerprint` when `_PACKAGE_CACHE` was last used, which is cleared
+# when the fingerprint changes, and the time.monotonic() at which it was last checked
+_PACKAGE_CACHE_FINGERPRINT: str | None = None
+_PACKAGE_CACHE_CHECKED_AT = -math.inf
+_REQUIRED_PACKAGE_CACHE: dict[str, bool] = {}
+
+
+def has_package(package_name: str, level: Literal["probe", "verify", "isolated"] = "probe") -> bool:
     """
     Helper function to generically check if a Python package is installed.
     Intended to be used to check for optional dependencies.
 
+    By default the check only looks for a module spec with
+    `importlib.util.find_spec()`, so the package itself is never executed (the
+    parent packages of a dotted name are still imported). Passing
+    ``level="verify"`` performs a full import instead, which also catches
+    packages that are present but fail to import. ``level="isolated"`` performs
+    the import in a helper process (see `openff.utilities.probing.probe_import`),
+    so that a package whose import hangs or crashes cannot affect this process.
+    Results are cached until packages are installed or removed (as detected by
+    `openff.utilities.caching.environment_fingerprint`, which is checked at most
+    once a second) or `clear_package_cache` is called.
+
     Parameters
     ----------
     package_name : str
         The name of the Python package to check the availability of
+    level : str, optional
+        ``"probe"`` to only look for a module spec, ``"verify"`` to import the package,
+        or ``"isolated"`` to import the package in a separate process.
 
     Returns
     -------
@@ -39,11 +75,86 @@ def has_package(package_name: str) -> bool:
     >>> has_foo
     False
     """
+    global _PACKAGE_CACHE_FINGERPRINT, _PACKAGE_CACHE_CHECKED_AT
+
+    # The fingerprint is checked at most once per revalidation interval, so that cache
+    # hits stay cheaper than importing an already imported package
+    now = time.monotonic()
+
+    if now - _PACKAGE_CACHE_CHECKED_AT >= caching._ENVIRONMENT_FINGERPRINT_REVALIDATE_INTERVAL:
+        fingerprint = caching.environment_fingerprint()
+
+        if fingerprint != _PACKAGE_CACHE_FINGERPRINT:
+            if _PACKAGE_CACHE_FINGERPRINT is not None:
+                clear_package_cache()
+
+            _PACKAGE_CACHE_FINGERPRINT = fingerprint
+
+        _PACKAGE_CACHE_CHECKED_AT = now
+
     try:
-        importlib.import_module(package_name)
-    except ModuleNotFoundError:
+        return _PACKAGE_CACHE[(package_name, level)]
+    except KeyError:
+        pass
+
+    if level == "probe":
+        package_available = _find_package_spec(package_name)
+    elif level == "verify":
+        try:
+            importlib.import_module(package_name)
+        except ModuleNotFoundError:
+            package_available = False
+        else:
+            package_available = True
+    elif level == "isolated":
+        from openff.utilities.probing import probe_import
+
+        package_available = probe_import(package_name).importable
+    else:
+        raise ValueError(f"Unknown level {level!r} passed to has_package. Expected 'probe', 'verify' or 'isolated'.")
+
+    _PACKAGE_CACHE[(package_name, level)] = package_available
+
+    return package_available
+
+
+def _find_package_spec(package_name: str) -> bool:
+    """Check whether a module spec can be found without executing the module itself."""
+    if package_name in sys.modules:
+        return sys.modules[package_name] is not None
+
+    try:
+        return importlib.util.find_spec(package_name) is not None
+    except (ImportError, ValueError):
+        # ImportError (incl. ModuleNotFoundError) is raised when a parent package is
+        # missing or broken, ValueError when the name is malformed or empty.
         return False
-    return True
+
+
+def clear_package_cache() -> None:
+    """
+    Forget every cached `has_package`, `requires_package` and OpenEye license
+    result, e.g. after installing a package into the running environment.
+    """
+    _PACKAGE_CACHE.clear()
+    _REQUIRED_PACKAGE_CACHE.clear()
+    _OPENEYE_LICENSE_CACHE.clear()
+    importlib.invalidate_caches()
+
+
+def _import_required_package(package_name: str) -> bool:
+    """Import a package needed by `requires_package`, returning whether the (cached)
+    import succeeded."""
+    if package_name not in _REQUIRED_PACKAGE_CACHE:
+        try:
+            with instrumentation.timer("requires_package.import"):
+                importlib.import_module(package_name)
+        except ImportError:
+            _REQUIRED_PACKAGE_CACHE[package_name] = False
+        else:
+            _REQUIRED_PACKAGE_CACHE[package_name] = True
+
+    return _REQUIRED_PACKAGE_CACHE[package_name]
 
 
 def requires_package(package_name: str) -> Callable[..., Any]:
@@ -53,6 +164,10 @@ def requires_package(package_name: str) -> Callable[..., Any]:
     `MissingOptionalDependencyError` if the package is not found by
     `importlib.import_module()`.
 
+    The import is only attempted on the first call. Its outcome, successful or
+    not, is shared by every function decorated with the same ``package_name``
+    until `clear_package_cache` is called.
+
     Parameters
     ----------
     package_name : str
@@ -67,14 +182,14 @@ def requires_package(package_name: str) -> Callable[..., Any]:
     def inner_decorator(function: F) -> F:
         @wraps(function)
         def wrapper(*args, **kwargs):  # type: ignore[no-untyped-def]
-            import importlib
+            if _REQUIRED_PACKAGE_CACHE.get(package_name) is True:
+                if instrumentation.ENABLED:
+                    instrumentation.increment("requires_package.cache_hits")
 
-            try:
-                importlib.import_module(package_name)
-            except ImportError:
+                return function(*args, **kwargs)
+
+            if not _import_required_package(package_name):
                 raise MissingOptionalDependencyError(library_name=package_name)
-            except Exception as e:
-                raise e
 
             return function(*args, **kwargs)
 
@@ -83,8 +198,44 @@ def requires_package(package_name: str) -> Callable[..., Any]:
     return inner_decorator
 
 
+OpenEyeModule = Literal["oechem", "oeomega", "oequacpac", "oeiupac", "oedepict"]
+
+_OPENEYE_LICENSE_FUNCTIONS: dict[str, str] = {
+    "oechem": "OEChemIsLicensed",
+    "oequacpac": "OEQuacPacIsLicensed",
+    "oeiupac": "OEIUPACIsLicensed",
+    "oeomega": "OEOmegaIsLicensed",
+    "oedepict": "OEDepictIsLicensed",
+}
+
+# module name -> (is licensed, time.monotonic() at which the license was checked)
+_OPENEYE_LICENSE_CACHE: dict[str, tuple[bool, float]] = {}
+
+
+def _is_openeye_module_licensed(module_name: str, license_ttl: float | None) -> bool:
+    """Return whether an (importable) OpenEye module is licensed, re-checking the
+    license only if the cached result is older than ``license_ttl`` seconds."""
+    cached = _OPENEYE_LICENSE_CACHE.get(module_name)
+
+    if cached is not None and (license_ttl is None or time.monotonic() - cached[1] < license_ttl):
+        if instrumentation.ENABLED:
+            instrumentation.increment("openeye.license_cache_hits")
+
+        return cached[0]
+
+    oe_module = importlib.import_module(f"openeye.{module_name}")
+
+    with instrumentation.timer("openeye.license_check"):
+        is_licensed = bool(getattr(oe_module, _OPENEYE_LICENSE_FUNCTIONS[module_name])())
+
+    _OPENEYE_LICENSE_CACHE[module_name] = (is_licensed, time.monotonic())
+
+    return is_licensed
+
+
 def requires_oe_module(
-    module_name: Literal["oechem", "oeomega", "oequacpac", "oeiupac", "oedepict"],
+    module_name: OpenEyeModule,
+    license_ttl: float | None = 300.0,
 ) -> Callable[..., Any]:
     """
     Helper function to denote that a funciton requires a particular OpenEye library.
@@ -92,10 +243,17 @@ def requires_oe_module(
     the module is not found by @requires_package or the module is not found to be
     licensed.
 
+    The result of the license check is cached per module and shared by all decorated
+    functions, so that the license function is not called on every invocation.
+
     Parameters
     ----------
     module_name : str
         The name of the OpenEye module to be imported.
+    license_ttl : float, optional
+        The number of seconds for which a cached license check is trusted before the
+        license is checked again. ``None`` trusts the first check for the lifetime of
+        the process, and ``0`` checks the license on every call.
 
     Raises
     ------
@@ -106,19 +264,7 @@ def requires_oe_module(
         @requires_package(f"openeye.{module_name}")
         @wraps(function)
         def wrapper(*args, **kwargs):  # type: ignore[no-untyped-def]
-            oe_module = importlib.import_module(f"openeye.{module_name}")
-
-            license_functions = {
-                "oechem": "OEChemIsLicensed",
-                "oequacpac": "OEQuacPacIsLicensed",
-                "oeiupac": "OEIUPACIsLicensed",
-                "oeomega": "OEOmegaIsLicensed",
-                "oedepict": "OEDepictIsLicensed",
-            }
-
-            is_licensed = getattr(oe_module, license_functions[module_name])()
-
-            if not is_licensed:
+            if not _is_openeye_module_licensed(module_name, license_ttl):
                 raise MissingOptionalDependencyError(library_name=f"openeye.{module_name}", license_issue=True)
 
             return function(*args, **kwargs)
@@ -128,29 +274,348 @@ def requires_oe_module(
     return inner_decorator
 
 
+def openeye_license_status(license_ttl: float | None = 300.0) -> dict[str, bool]:
+    """
+    Check the license of every OpenEye module supported by `requires_oe_module` at once.
+
+    Modules which cannot be imported are reported as unlicensed. The results share
+    the cache used by `requires_oe_module`.
+
+    Parameters
+    ----------
+    license_ttl : float, optional
+        The number of seconds for which a cached license check is trusted. Pass ``0``
+        to force every license to be checked again.
+
+    Returns
+    -------
+    license_status : dict[str, bool]
+        Whether each OpenEye module, keyed by name (e.g. ``"oechem"``), is usable.
+    """
+    license_status = {}
+
+    for module_name in _OPENEYE_LICENSE_FUNCTIONS:
+        try:
+            license_status[module_name] = _is_openeye_module_licensed(module_name, license_ttl)
+        except ImportError:
+            license_status[module_name] = False
+
+    return license_status
+
+
+class _LazyModule(types.ModuleType):
+    """A placeholder for a module which is only imported once one of its attributes is
+    first accessed. See `lazy_import`."""
+
+    def __init__(self, module_name: str, license_ttl: float | None):
+        super().__init__(module_name)
+
+        self._lazy_license_ttl = license_ttl
+        self._lazy_lock = threading.Lock()
+        self._lazy_module: types.ModuleType | None = None
+
+    def _load(self) -> types.ModuleType:
+        with self._lazy_lock:
+            if self._lazy_module is not None:
+                return self._lazy_module
+
+            try:
+                module = importlib.import_module(self.__name__)
+            except ImportError:
+                raise MissingOptionalDependencyError(library_name=self.__name__)
+
+            package_name, _, module_name = self.__name__.partition(".")
+
+            if (
+                package_name == "openeye"
+                and module_name in _OPENEYE_LICENSE_FUNCTIONS
+                and not _is_openeye_module_licensed(module_name, self._lazy_license_ttl)
+            ):
+                raise MissingOptionalDependencyError(library_name=self.__name__, license_issue=True)
+
+            # Copy the contents of the module into this one so that later lookups are
+            # plain attribute accesses, rather than going through `__getattr__`
+            self.__dict__.update(module.__dict__)
+            self._lazy_module = module
+
+            return module
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_lazy_"):
+            raise AttributeError(name)
+
+        return getattr(self._load(), name)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__.get("_lazy_module") is not None else "not yet loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(module_name: str, license_ttl: float | None = 300.0) -> types.ModuleType:
+    """
+    Return a placeholder for a module which defers importing it until one of its
+    attributes is first accessed, so that code paths which never use an optional
+    dependency do not pay the cost of importing it.
+
+    If the module cannot be imported, the first attribute access raises
+    `MissingOptionalDependencyError`. For the OpenEye modules supported by
+    `requires_oe_module`, the first access also checks that the module is licensed.
+
+    Parameters
+    ----------
+    module_name : str
+        The name of the module, e.g. ``"openeye.oechem"``.
+    license_ttl : float, optional
+        For OpenEye modules, the number of seconds for which a cached license check is
+        trusted. See `requires_oe_module`.
+
+    Returns
+    -------
+        A module which imports ``module_name`` on first use.
+
+    Examples
+    --------
+    >>> oechem = lazy_import("openeye.oechem")
+    >>> def to_smiles(molecule):
+    ...     return oechem.OEMolToSmiles(molecule)
+    """
+    return _LazyModule(module_name, license_ttl)
+
+
+def _is_executable(fpath: str) -> bool:
+    return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
+
+
+# How long (in seconds) a PATH index is trusted before the modification times of its
+# directories are checked again
+_PATH_INDEX_REVALIDATE_INTERVAL = 1.0
+_PATH_INDEX_MAX_ENTRIES = 8
+
+
+class _PathIndex:
+    """An index of the file names found in each directory of a single ``PATH`` value."""
+
+    def __init__(self, path: str):
+        self.directories = [directory.strip('"') for directory in path.split(os.pathsep)]
+
+        self.lock = threading.Lock()
+        self.contents: dict[str, tuple[float | None, frozenset[str]]] = {}
+        # The directories in which each program may be found, in ``PATH`` order. This
+        # only depends on the directory listings, so the candidates are still checked on
+        # each lookup, e.g. in case their permissions have changed
+        self.candidates: dict[str, list[str]] = {}
+        self.validated_at = -math.inf
+
+    @staticmethod
+    def _scan(directory: str) -> tuple[float | None, frozenset[str]]:
+        try:
+            with instrumentation.timer("executables.scan_directory"):
+                modified_time = os.stat(directory).st_mtime
+                return modified_time, frozenset(os.listdir(directory))
+        except OSError:
+            return None, frozenset()
+
+    def _revalidate(self) -> None:
+        now = time.monotonic()
+
+        if now - self.validated_at < _PATH_INDEX_REVALIDATE_INTERVAL:
+            return
+
+        changed = False
+
+        for directory in self.directories:
+            if not os.path.isabs(directory):
+                continue
+
+            try:
+                modified_time: float | None = os.stat(directory).st_mtime
+            except OSError:
+                modified_time = None
+
+            cached = self.contents.get(directory)
+
+            if cached is None or cached[0] != modified_time:
+                self.contents[directory] = self._scan(directory)
+                changed = True
+
+        if changed:
+            self.candidates.clear()
+
+        self.validated_at = now
+
+    def _get_candidates(self, program_name: str) -> list[str]:
+        candidates = self.candidates.get(program_name)
+
+        if candidates is None:
+            # Relative entries (including the empty string) depend on the current
+            # working directory, so are always candidates
+            candidates = self.candidates[program_name] = [
+                directory
+                for directory in self.directories
+                if not os.path.isabs(directory) or program_name in self.contents[directory][1]
+            ]
+
+        return candidates
+
+    def find(self, program_names: Iterable[str]) -> dict[str, str | None]:
+        with self.lock:
+            self._revalidate()
+
+            found: dict[str, str | None] = {}
+
+            for program_name in program_names:
+                found[program_name] = None
+
+                for directory in self._get_candidates(program_name):
+                    exe_file = os.path.join(directory, program_name)
+
+                    if _is_executable(exe_file):
+                        found[program_name] = os.path.abspath(exe_file)
+                        break
+
+            return found
+
+
+_PATH_INDEXES: dict[str, _PathIndex] = {}
+_PATH_INDEXES_LOCK = threading.Lock()
+
+
+def _get_path_index() -> _PathIndex:
+    path = os.environ.get("PATH", "")
+
+    with _PATH_INDEXES_LOCK:
+        try:
+            return _PATH_INDEXES[path]
+        except KeyError:
+            pass
+
+        if len(_PATH_INDEXES) >= _PATH_INDEX_MAX_ENTRIES:
+            del _PATH_INDEXES[next(iter(_PATH_INDEXES))]
+
+        path_index = _PATH_INDEXES[path] = _PathIndex(path)
+
+    return path_index
+
+
+def find_executables(program_names: Iterable[str]) -> dict[str, str | None]:
+    """
+    Resolve several executables with a single pass over ``PATH``.
+
+    Parameters
+    ----------
+    program_names : iterable of str
+        The names of, or paths to, the executables to look for.
+
+    Returns
+    -------
+    executable_paths : dict[str, str | None]
+        The absolute path to each executable, or ``None`` if it could not be found.
+
+    See Also
+    --------
+    find_executable, for resolving a single executable.
+    """
+    program_names = list(program_names)
+
+    found: dict[str, str | None] = {}
+    to_search = []
+
+    for program_name in program_names:
+        if os.path.dirname(program_name):
+            found[program_name] = os.path.abspath(program_name) if _is_executable(program_name) else None
+        else:
+            to_search.append(program_name)
+
+    if to_search:
+        with instrumentation.timer("executables.find"):
+            found.update(_get_path_index().find(to_search))
+
+    return {program_name: found[program_name] for program_name in program_names}
+
+
+def find_executable(program_name: str) -> str | None:
+    """
+    Find the absolute path to an executable, similar to the ``which`` command.
+
+    Names without a directory component are looked up in each ``PATH`` entry in turn.
+    The files in each directory are indexed the first time a given ``PATH`` is searched,
+    and a directory is only re-listed once its modification time changes, so only the
+    files with a matching name are checked. Files added or removed are noticed within
+    about a second; call `clear_executable_cache` to pick them up immediately.
+
+    Parameters
+    ----------
+    program_name : str
+        The name of, or path to, the executable.
+
+    Returns
+    -------
+    executable_path : str or None
+        The absolute path to the executable, or ``None`` if it could not be found.
+    """
+    return find_executables([program_name])[program_name]
+
+
 def has_executable(program_name: str) -> bool:
-    import os
+    """
+    Check whether an executable can be found on ``PATH``, or at the given path.
+
+    See Also
+    --------
+    find_executable, for retrieving the path to the executable.
+    """
+    return find_executable(program_name) is not None
+
 
-    def _is_executable(fpath: str) -> bool:
-        return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
+def clear_executable_cache() -> None:
+    """Forget every indexed ``PATH`` used by `has_executable` and `find_executable`."""
+    with _PATH_INDEXES_LOCK:
+        _PATH_INDEXES.clear()
 
-    fpath, _ = os.path.split(program_name)
 
-    if fpath:
-        if _is_executable(program_name):
-            return True
+def _temporary_directory(pool: "ScratchDirectoryPool | None", deferred_cleanup: bool) -> AbstractContextManager[str]:
+    """Create a temporary directory, borrowing it from ``pool`` if one is given."""
+    from tempfile import TemporaryDirectory
+
+    if pool is not None and deferred_cleanup:
+        raise ValueError("A scratch directory pool cannot be combined with deferred cleanup.")
+
+    directory: AbstractContextManager[str]
+
+    if pool is not None:
+        directory = pool.directory()
+    elif deferred_cleanup:
+        from openff.utilities.scratch import deferred_temporary_directory
+
+        directory = deferred_temporary_directory()
     else:
-        for path in os.environ["PATH"].split(os.pathsep):
-            path = path.strip('"')
-            exe_file = os.path.join(path, program_name)
-            if _is_executable(exe_file):
-                return True
+        directory = TemporaryDirectory()
+
+    return _timed_temporary_directory(directory) if instrumentation.ENABLED else directory
 
-    return False
+
+@contextmanager
+def _timed_temporary_directory(directory: AbstractContextManager[str]) -> Generator[str, None, None]:
+    """Record the time taken to create and to clean up a temporary directory."""
+    with instrumentation.timer("temporary_directory.setup"):
+        directory_path = directory.__enter__()
+
+    try:
+        yield directory_path
+    finally:
+        with instrumentation.timer("temporary_directory.teardown"):
+            directory.__exit__(None, None, None)
 
 
 @contextmanager
-def temporary_cd(directory_path: str | None = None) -> Generator[None, None, None]:
+def temporary_cd(
+    directory_path: str | None = None,
+    pool: "ScratchDirectoryPool | None" = None,
+    deferred_cleanup: bool = False,
+) -> Generator[None, None, None]:
     """Temporarily move the current working directory to the path
     specified. If no path is given, a temporary directory will be
     created, moved into, and then destroyed when the context manager
@@ -159,10 +624,22 @@ def temporary_cd(directory_path: str | None = None) -> Generator[None, None, Non
     Parameters
     ----------
     directory_path: str, optional
+    pool: ScratchDirectoryPool, optional
+        A pool to borrow the temporary directory from, and return it to, instead of
+        creating and destroying a new one. Only used if no path is given.
+    deferred_cleanup: bool
+        Whether to delete the temporary directory on a background thread (see
+        `openff.utilities.scratch.defer_removal`) rather than before the context
+        manager exits. Only used if no path is given.
 
     Returns
     -------
 
+    See Also
+    --------
+    scoped_directory, for a variant which does not change the working directory of the
+    whole process and so can be used from multiple threads or asyncio tasks.
+
     """
 
     if directory_path is not None and len(directory_path) == 0:
@@ -173,7 +650,7 @@ def temporary_cd(directory_path: str | None = None) -> Generator[None, None, Non
 
     try:
         if directory_path is None:
-            with TemporaryDirectory() as new_directory:
+            with _temporary_directory(pool, deferred_cleanup) as new_directory:
                 os.chdir(new_directory)
                 yield
 
@@ -185,6 +662,297 @@ def temporary_cd(directory_path: str | None = None) -> Generator[None, None, Non
         os.chdir(old_directory)
 
 
+_SCOPED_DIRECTORY: ContextVar[str | None] = ContextVar("openff_utilities_scoped_directory", default=None)
+
+
+def get_scoped_directory() -> str:
+    """
+    Return the working directory of the current thread or asyncio task.
+
+    This is the directory entered by the innermost `scoped_directory` block of the
+    current context, or the process' working directory outside of any such block.
+    """
+    scoped_directory = _SCOPED_DIRECTORY.get()
+    return os.getcwd() if scoped_directory is None else scoped_directory
+
+
+def scoped_path(path: str | os.PathLike[str]) -> str:
+    """
+    Resolve a path relative to the working directory of the current thread or
+    asyncio task (see `scoped_directory`). Absolute paths are returned unchanged.
+    """
+    return os.path.join(get_scoped_directory(), path)
+
+
+@contextmanager
+def scoped_directory(
+    directory_path: str | None = None,
+    pool: "ScratchDirectoryPool | None" = None,
+    deferred_cleanup: bool = False,
+) -> Generator[str, None, None]:
+    """A thread- and asyncio-safe alternative to `temporary_cd`.
+
+    Rather than calling `os.chdir`, which changes the working directory of the whole
+    process, the directory is recorded in a `contextvars.ContextVar`. Each thread or
+    asyncio task therefore sees its own directory, which can be used to build paths
+    with `scoped_path` and to launch programs with `scoped_run`. If no path is given,
+    a temporary directory is created and then destroyed when the context manager is
+    closed.
+
+    Parameters
+    ----------
+    directory_path: str, optional
+        The directory to use, resolved relative to the current scoped directory.
+    pool: ScratchDirectoryPool, optional
+        A pool to borrow the temporary directory from, and return it to, instead of
+        creating and destroying a new one. Only used if no path is given.
+    deferred_cleanup: bool
+        Whether to delete the temporary directory on a background thread (see
+        `openff.utilities.scratch.defer_removal`) rather than before the context
+        manager exits. Only used if no path is given.
+
+    Returns
+    -------
+        The absolute path to the scoped directory.
+
+    Raises
+    ------
+    NotADirectoryError
+    """
+
+    if directory_path is not None and len(directory_path) == 0:
+        yield get_scoped_directory()
+        return
+
+    if directory_path is None:
+        with _temporary_directory(pool, deferred_cleanup) as new_directory:
+            token = _SCOPED_DIRECTORY.set(new_directory)
+
+            try:
+                yield new_directory
+            finally:
+                _SCOPED_DIRECTORY.reset(token)
+
+        return
+
+    new_directory = os.path.abspath(scoped_path(directory_path))
+
+    if not os.path.isdir(new_directory):
+        raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), new_directory)
+
+    token = _SCOPED_DIRECTORY.set(new_directory)
+
+    try:
+        yield new_directory
+    finally:
+        _SCOPED_DIRECTORY.reset(token)
+
+
+def scoped_run(args: Sequence[str], **kwargs: Any) -> "subprocess.CompletedProcess[Any]":
+    """
+    Run a program with `subprocess.run` inside the working directory of the current
+    thread or asyncio task (see `scoped_directory`), unless ``cwd`` is given explicitly.
+
+    Parameters
+    ----------
+    args
+        The program and its arguments.
+    kwargs
+        Any other arguments accepted by `subprocess.run`.
+    """
+    import subprocess
+
+    kwargs.setdefault("cwd", get_scoped_directory())
+
+    return subprocess.run(args, **kwargs)
+
+
+class _DataIndex:
+    """An index of every file and directory within an installed package, keyed by
+    their normalized POSIX path relative to the package."""
+
+    def __init__(self, root: str):
+        from pathlib import PurePath
+
+        root_posix = PurePath(root).as_posix()
+
+        self.files: dict[str, str] = {}
+        self.directories: dict[str, str] = {".": root_posix}
+
+        for directory_path, directory_names, file_names in os.walk(root):
+            relative_directory = PurePath(os.path.relpath(directory_path, root)).as_posix()
+            prefix = "" if relative_directory == "." else f"{relative_directory}/"
+
+            for directory_name in directory_names:
+                self.directories[f"{prefix}{directory_name}"] = f"{root_posix}/{prefix}{directory_name}"
+            for file_name in file_names:
+                self.files[f"{prefix}{file_name}"] = f"{root_posix}/{prefix}{file_name}"
+
+
+_DATA_INDEXES: dict[str, _DataIndex | None] = {}
+_DATA_INDEXES_LOCK = threading.Lock()
+
+
+def _get_data_index(package_name: str) -> _DataIndex | None:
+    """Return the (lazily built) index of a package's files, or ``None`` if the package
+    does not live on the file system, e.g. if it is installed as a zip file."""
+    from importlib.resources import files
+    from pathlib import Path
+
+    try:
+        return _DATA_INDEXES[package_name]
+    except KeyError:
+        pass
+
+    with _DATA_INDEXES_LOCK:
+        if package_name not in _DATA_INDEXES:
+            with instrumentation.timer("data_path.build_index"):
+                package_root = files(package_name)
+
+                _DATA_INDEXES[package_name] = (
+                    _DataIndex(str(package_root)) if isinstance(package_root, Path) and package_root.is_dir() else None
+                )
+
+        return _DATA_INDEXES[package_name]
+
+
+def _lookup_data_path(relative_path: str, package_name: str, kind: Literal["files", "directories"]) -> str | None:
+    """Find a path in the index of a package, trying both ``relative_path`` and
+    ``data/relative_path``. Returns ``None`` if the path could not be found in the index,
+    or no longer exists, in which case the caller should fall back to searching with
+    `importlib.resources`."""
+    from pathlib import PurePath
+
+    key = posixpath.normpath(PurePath(relative_path).as_posix())
+
+    if key.startswith(("/", "..")) or "/../" in key:
+        return None
+
+    data_index = _get_data_index(package_name)
+
+    if data_index is None:
+        return None
+
+    entries = data_index.files if kind == "files" else data_index.directories
+
+    if instrumentation.ENABLED:
+        instrumentation.increment("data_path.index_lookups")
+
+    data_key = "data" if key == "." else f"data/{key}"
+    exists = os.path.isfile if kind == "files" else os.path.isdir
+
+    # Each hit costs a single stat, so that paths deleted since the index was built
+    # are reported as missing rather than returned
+    for candidate_key in (key, data_key):
+        indexed_path = entries.get(candidate_key)
+
+        if indexed_path is not None and exists(indexed_path):
+            return indexed_path
+
+    return None
+
+
+def clear_data_path_cache() -> None:
+    """
+    Forget the indexes of package files used by `get_data_file_path` and
+    `get_data_dir_path`, and the files mapped by `open_data_file`, e.g. after files
+    have been added to an installed package.
+
+    Files extracted from packages which do not live on the file system are kept on
+    disk, but will be looked up again.
+    """
+    with _DATA_INDEXES_LOCK:
+        _DATA_INDEXES.clear()
+        _EXTRACTED_DATA_FILES.clear()
+
+    with _DATA_FILE_MAPPINGS_LOCK:
+        _DATA_FILE_MAPPINGS.clear()
+
+
+# The maximum total size of the files extracted by `_extract_data_file`
+_EXTRACTED_DATA_FILES_MAX_BYTES = 1024**3
+
+_EXTRACTED_DATA_FILES: dict[tuple[str, str], str] = {}
+
+
+def _package_origin_key(package_name: str) -> str:
+    """Identify the installed copy of a package, e.g. the path, size and modification time
+    of the zip file it was imported from."""
+    spec = importlib.util.find_spec(package_name)
+    origin = package_name if spec is None or spec.origin is None else spec.origin
+
+    # Walk up from the module inside the archive to the archive itself
+    archive_path = origin
+
+    while not os.path.exists(archive_path) and os.path.dirname(archive_path) != archive_path:
+        archive_path = os.path.dirname(archive_path)
+
+    try:
+        stat_result = os.stat(archive_path)
+    except OSError:
+        return origin
+
+    return f"{origin}:{stat_result.st_size}:{stat_result.st_mtime_ns}"
+
+
+def _extract_data_file(traversable: "Traversable", package_name: str, relative_path: str) -> str:
+    """Copy a data file of a package which does not live on the file system into a
+    persistent cache, returning the path to the copy.
+
+    Copies are stored by the hash of their contents, and a small reference file maps the
+    installed package and ``relative_path`` to the copy so that later lookups, including
+    from other processes, do not need to read the file again. The least recently used
+    copies are deleted once the cache grows beyond `_EXTRACTED_DATA_FILES_MAX_BYTES`."""
+    import hashlib
+    from pathlib import PurePath
+
+    from openff.utilities.caching import atomic_write, evict_least_recently_used, get_cache_dir
+
+    extracted_path = _EXTRACTED_DATA_FILES.get((package_name, relative_path))
+
+    if extracted_path is not None and os.path.isfile(extracted_path):
+        return extracted_path
+
+    cache_dir = get_cache_dir("data-files")
+
+    reference_key = "\0".join([package_name, _package_origin_key(package_name), relative_path])
+    reference_path = os.path.join(cache_dir, "references", hashlib.sha256(reference_key.encode()).hexdigest())
+
+    try:
+        with open(reference_path) as file:
+            extracted_path = os.path.join(cache_dir, file.read())
+
+        if os.path.isfile(extracted_path):
+            os.utime(extracted_path)
+        else:
+            extracted_path = None
+    except OSError:
+        extracted_path = None
+
+    if extracted_path is None:
+        contents = traversable.read_bytes()
+        digest = hashlib.sha256(contents).hexdigest()
+
+        relative_extracted_path = os.path.join("objects", digest[:2], digest, traversable.name)
+        extracted_path = os.path.join(cache_dir, relative_extracted_path)
+
+        if os.path.isfile(extracted_path):
+            os.utime(extracted_path)
+        else:
+            evict_least_recently_used(
+                os.path.join(cache_dir, "objects"),
+                max(_EXTRACTED_DATA_FILES_MAX_BYTES - len(contents), 0),
+            )
+            atomic_write(extracted_path, contents)
+
+        atomic_write(reference_path, relative_extracted_path.encode())
+
+    extracted_path = PurePath(extracted_path).as_posix()
+    _EXTRACTED_DATA_FILES[(package_name, relative_path)] = extracted_path
+
+    return extracted_path
+
+
 def get_data_dir_path(relative_path: str, package_name: str) -> str:
     """Get the full path to a directory within a module's tree.
 
@@ -212,13 +980,21 @@ def get_data_dir_path(relative_path: str, package_name: str) -> str:
     get_data_file_path, for getting the path to a particular file in a data directory.
 
     """
-    with as_file(files(package_name) / relative_path) as dir_path:
-        if dir_path.is_dir():
-            return dir_path.as_posix()
+    from importlib.resources import as_file, files
 
-    with as_file(files(package_name) / "data" / relative_path) as dir_path:
-        if dir_path.is_dir():
-            return dir_path.as_posix()
+    indexed_path = _lookup_data_path(relative_path, package_name, "directories")
+
+    if indexed_path is not None:
+        return indexed_path
+
+    with instrumentation.timer("data_path.search"):
+        with as_file(files(package_name) / relative_path) as dir_path:
+            if dir_path.is_dir():
+                return dir_path.as_posix()
+
+        with as_file(files(package_name) / "data" / relative_path) as dir_path:
+            if dir_path.is_dir():
+                return dir_path.as_posix()
 
     raise NotADirectoryError(f"Directory {relative_path} not found in {package_name}.")
 
@@ -249,14 +1025,129 @@ def get_data_file_path(relative_path: str, package_name: str) -> str:
     See Also
     --------
     get_data_dir_path, for getting the path to a directory instead of an individual file.
+    get_data_file_paths, for getting the paths to many files at once.
+
+    """
+    from importlib.resources import as_file, files
+    from pathlib import Path
+
+    indexed_path = _lookup_data_path(relative_path, package_name, "files")
+
+    if indexed_path is not None:
+        return indexed_path
+
+    with instrumentation.timer("data_path.search"):
+        for candidate_path in [relative_path, f"data/{relative_path}"]:
+            traversable = files(package_name) / candidate_path
+
+            if not isinstance(traversable, Path):
+                # e.g. a package installed as a zip file, whose files would only exist for
+                # the lifetime of the ``as_file`` context
+                if traversable.is_file():
+                    return _extract_data_file(traversable, package_name, candidate_path)
+
+                continue
+
+            with as_file(traversable) as file_path:
+                if file_path.is_file():
+                    return file_path.as_posix()
+
+    raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(traversable))
+
+
+def get_data_file_paths(relative_paths: Iterable[str], package_name: str) -> list[str]:
+    """Get the full paths to several files in the data directory of one package.
+
+    Each path is resolved as by `get_data_file_path`.
 
+    Parameters
+    ----------
+    relative_paths : iterable of str
+        The relative paths of the files to load.
+    package_name : str
+        The name of the package in which the files are to be loaded, i.e.
+        "openff.toolkit" or "openff.evaluator"
+
+    Returns
+    -------
+        The absolute paths to the files, in the same order as ``relative_paths``.
+
+    Raises
+    ------
+    FileNotFoundError
     """
-    with as_file(files(package_name) / relative_path) as file_path:
-        if file_path.is_file():
-            return file_path.as_posix()
+    return [get_data_file_path(relative_path, package_name) for relative_path in relative_paths]
+
+
+# path -> (the inode, modification time and size of the file when it was mapped, mapping)
+_DATA_FILE_MAPPINGS: dict[str, tuple[tuple[int, int, int], memoryview]] = {}
+_DATA_FILE_MAPPINGS_LOCK = threading.Lock()
+
+
+def open_data_file(relative_path: str, package_name: str) -> memoryview:
+    """Get a read-only, memory-mapped view of one of the files in the data directory.
+
+    The file is resolved as by `get_data_file_path` and mapped with `mmap`, so its
+    contents are read from the operating system's page cache on demand rather than
+    copied into each process. Processes which map the same file, including forked or
+    spawned workers, therefore share a single copy of it in memory. The mapping is
+    reused by later calls for the same file until the file is replaced or modified,
+    or `clear_data_path_cache` is called.
+
+    Data files should be replaced (e.g. by installing a new version of the package)
+    rather than modified in place: reading a view of a file which has since been
+    truncated may crash the interpreter with ``SIGBUS``.
+
+    Parameters
+    ----------
+    relative_path : str
+        The relative path of the file to load.
+    package_name : str
+        The name of the package in which a file is to be loaded, i.e.
+        "openff.toolkit" or "openff.evaluator"
+
+    Returns
+    -------
+        A read-only view of the contents of the file.
+
+    Raises
+    ------
+    FileNotFoundError
+
+    Examples
+    --------
+    >>> contents = open_data_file("data.dat", "openff.utilities")
+    >>> header = bytes(contents[:16])
+    """
+    import mmap
+
+    file_path = get_data_file_path(relative_path, package_name)
+
+    stat_result = os.stat(file_path)
+    version = (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+
+    cached = _DATA_FILE_MAPPINGS.get(file_path)
+
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _DATA_FILE_MAPPINGS_LOCK:
+        cached = _DATA_FILE_MAPPINGS.get(file_path)
+
+        if cached is None or cached[0] != version:
+            with open(file_path, "rb") as file:
+                stat_result = os.fstat(file.fileno())
+
+                if stat_result.st_size == 0:
+                    # Empty files cannot be memory mapped
+                    contents = memoryview(b"")
+                else:
+                    contents = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
 
-    with as_file(files(package_name) / "data" / relative_path) as file_path:
-        if file_path.is_file():
-            return file_path.as_posix()
+            # Mappings handed out earlier are left open, as callers may still use them
+            cached = _DATA_FILE_MAPPINGS[file_path] = (
+                (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size),
+                contents,
+            )
 
-    raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), file_path)
+        return cached[1]